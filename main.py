@@ -1,29 +1,51 @@
+import os
 import networkx as nx
 
-from matplotlib import pyplot as plt
+from typing import Iterable, Tuple
 
-from strandssolver.solver import solver
-from strandssolver.readers import htmlreader
+from strandssolver.solver import solver, solverstats
 from strandssolver.parsers import htmlparser
-from strandssolver.models import graph, dictionarytrie
+from strandssolver.models import graph, dictionarytrie, lettercountindex
 from strandssolver.test.data import filepaths
+from strandssolver.dfs.typing import Node
 
 
 def main() -> None:
+    # Selenium is only needed once a page is fetched
+    from strandssolver.readers import htmlreader
     reader = htmlreader.HTMLReader()
     parser = htmlparser.HTMLParser(html_reader=reader)
     game = parser.parse()
-    game_graph = graph.CharacterGraphBuilder.build_graph_from_board(game.board)
-    trie = dictionarytrie.DictionaryTrieBuilder.load_trie_from_json(
-        filepaths.words_trie_path)
+    stats = solverstats.SolverStats()
+    with stats.timer("graph_build"):
+        game_graph = graph.CharacterGraphBuilder.build_graph_from_board(
+            game.board)
+    with stats.timer("trie_load"):
+        trie = dictionarytrie.DictionaryTrieBuilder.load_trie_from_binary(
+            filepaths.words_trie_binary_path)
+        letter_count_index = None
+        if os.path.exists(filepaths.words_letter_count_index_path):
+            letter_count_index = \
+                lettercountindex.LetterCountIndexBuilder.load(
+                    filepaths.words_letter_count_index_path)
 
-    game_solver = solver.Solver(graph=game_graph, game=game, trie=trie)
-    solution = game_solver.solve()
+    game_solver = solver.Solver(graph=game_graph, game=game, trie=trie,
+                                search_mode=solver.SearchMode.BITBOARD,
+                                letter_count_index=letter_count_index)
+    solution, stats = game_solver.solve_with_stats(stats)
     for word in solution:
         string = ""
         for node in word:
             string += game_graph.nodes[node]["character"]
         print(string)
+    print(stats.to_json())
+    draw_solution(game_graph, solution)
+
+
+def draw_solution(game_graph: nx.Graph,
+                  solution: Iterable[Tuple[Node]]) -> None:
+    # Plotting is the slowest import by far, so only pay for it here
+    from matplotlib import pyplot as plt
 
     pos = nx.spring_layout(game_graph)
     nx.draw_networkx_nodes(game_graph, pos=pos)
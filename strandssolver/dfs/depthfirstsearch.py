@@ -3,9 +3,19 @@ import networkx as nx
 from typing import Callable, Iterable, Set, Optional, List, Tuple
 
 from strandssolver.dfs import dfsvisitor, dfsexceptions, dfsdepth
+from strandssolver.dfs.dfsaction import DFSAction
 from strandssolver.dfs.typing import Node, Edge
 
 
+def _raise_for_action(action: Optional[DFSAction]) -> None:
+    # Visitors may also steer the search with return codes,
+    # this engine translates them into its exceptions
+    if action is DFSAction.PRUNE_SEARCH:
+        raise dfsexceptions.PruneSearch()
+    if action is DFSAction.STOP_SEARCH:
+        raise dfsexceptions.StopSearch()
+
+
 def _dfs_for_child(parent: Node, child: Node,
                    stack: List[Tuple[Node, Iterable[Node]]],
                    visited: Set[Node], completed: Set[Node],
@@ -18,13 +28,13 @@ def _dfs_for_child(parent: Node, child: Node,
     kwargs["dfs_edge"] = edge
     # Black node?
     if child in completed:
-        dfs_visitor.forward_or_cross_edge(edge, **kwargs)
+        _raise_for_action(dfs_visitor.forward_or_cross_edge(edge, **kwargs))
     # Grey node?
     elif child in visited:
-        dfs_visitor.back_edge(edge, **kwargs)
+        _raise_for_action(dfs_visitor.back_edge(edge, **kwargs))
     # Then must be white node
     else:
-        dfs_visitor.tree_edge(edge, **kwargs)
+        _raise_for_action(dfs_visitor.tree_edge(edge, **kwargs))
         yield parent, child
         # visited.add(child)
         if depth.depth_now < depth.depth_limit:
@@ -43,7 +53,10 @@ def _finish_node(parent: Node, stack: List[Tuple[Node, Iterable[Node]]],
     stack.pop()
     depth.depth_now -= 1
     try:
-        dfs_visitor.finish_vertex(parent, **kwargs)
+        action = dfs_visitor.finish_vertex(parent, **kwargs)
+        if action is DFSAction.REVISIT_VERTEX:
+            completed.remove(parent)
+        _raise_for_action(action)
     except dfsexceptions.PruneSearch:
         # Not really necessary since pruning on exit is pointless,
         # but better to not propagate an exception
@@ -63,7 +76,7 @@ def _dfs_while_stack(stack: List[Tuple[Node, Iterable[Node]]],
     if parent not in visited:
         try:
             visited.add(parent)
-            dfs_visitor.discover_vertex(parent, **kwargs)
+            _raise_for_action(dfs_visitor.discover_vertex(parent, **kwargs))
         except dfsexceptions.PruneSearch:
             _finish_node(parent=parent, stack=stack,
                          completed=completed, visited=visited,
@@ -0,0 +1,15 @@
+import enum
+
+
+class DFSAction(enum.Enum):
+    """
+    Return codes for DFSVisitor callbacks, the exception-free counterparts
+    of dfsexceptions. Returning None means CONTINUE.
+    REVISIT_VERTEX is only meaningful from finish_vertex: the vertex is
+    turned white again instead of black, so it can be discovered again
+    on another path.
+    """
+    CONTINUE = enum.auto()
+    PRUNE_SEARCH = enum.auto()
+    STOP_SEARCH = enum.auto()
+    REVISIT_VERTEX = enum.auto()
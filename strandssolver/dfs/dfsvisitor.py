@@ -1,22 +1,32 @@
-from typing import Protocol, Iterable
+from typing import Protocol, Iterable, Optional
 
+from strandssolver.dfs.dfsaction import DFSAction
 from strandssolver.dfs.typing import Edge, Vertex
 
 
 class DFSVisitor(Protocol):
-    def back_edge(self, edge: Edge, **kwargs) -> None:
+    """
+    Callbacks of a depth first search. Each callback may steer the search by
+    returning a DFSAction; returning None continues as usual.
+    """
+    def back_edge(self, edge: Edge, **kwargs
+                  ) -> Optional[DFSAction]:
         raise NotImplementedError()
 
-    def discover_vertex(self, vertex: Vertex, **kwargs) -> None:
+    def discover_vertex(self, vertex: Vertex, **kwargs
+                        ) -> Optional[DFSAction]:
         raise NotImplementedError()
 
-    def finish_vertex(self, vertex: Vertex, **kwargs) -> None:
+    def finish_vertex(self, vertex: Vertex, **kwargs
+                      ) -> Optional[DFSAction]:
         raise NotImplementedError()
 
-    def forward_or_cross_edge(self, edge: Edge, **kwargs) -> None:
+    def forward_or_cross_edge(self, edge: Edge, **kwargs
+                              ) -> Optional[DFSAction]:
         raise NotImplementedError()
 
-    def tree_edge(self, edge: Edge, **kwargs) -> None:
+    def tree_edge(self, edge: Edge, **kwargs
+                  ) -> Optional[DFSAction]:
         raise NotImplementedError()
 
     def sort_neighbors(self, neighbors: Iterable[Vertex], **kwargs
@@ -25,7 +35,8 @@ class DFSVisitor(Protocol):
 
 
 class IdleDFSVisitor(DFSVisitor):
-    def back_edge(self, edge: Edge, **kwargs) -> None:
+    def back_edge(self, edge: Edge, **kwargs
+                  ) -> Optional[DFSAction]:
         """
         When encountering a back edge, do nothing.
         :param edge: back edge
@@ -33,7 +44,8 @@ class IdleDFSVisitor(DFSVisitor):
         """
         pass
 
-    def discover_vertex(self, vertex: Vertex, **kwargs) -> None:
+    def discover_vertex(self, vertex: Vertex, **kwargs
+                        ) -> Optional[DFSAction]:
         """
         When encountering a vertex, do nothing.
         :param vertex: discovered vertex
@@ -41,7 +53,8 @@ class IdleDFSVisitor(DFSVisitor):
         """
         pass
 
-    def finish_vertex(self, vertex: Vertex, **kwargs) -> None:
+    def finish_vertex(self, vertex: Vertex, **kwargs
+                      ) -> Optional[DFSAction]:
         """
         When finishing a vertex, do nothing.
         :param vertex: finished vertex
@@ -49,7 +62,8 @@ class IdleDFSVisitor(DFSVisitor):
         """
         pass
 
-    def forward_or_cross_edge(self, edge: Edge, **kwargs) -> None:
+    def forward_or_cross_edge(self, edge: Edge, **kwargs
+                              ) -> Optional[DFSAction]:
         """
         When encountering a forward or cross edge, do nothing.
         :param edge: forward or cross edge
@@ -57,7 +71,8 @@ class IdleDFSVisitor(DFSVisitor):
         """
         pass
 
-    def tree_edge(self, edge: Edge, **kwargs) -> None:
+    def tree_edge(self, edge: Edge, **kwargs
+                  ) -> Optional[DFSAction]:
         """
         When encountering a tree edge, do nothing.
         :param edge: tree edge
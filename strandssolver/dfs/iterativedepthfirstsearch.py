@@ -0,0 +1,187 @@
+import networkx as nx
+
+from typing import Callable, Iterable, Set, Optional, List, Tuple, Dict, Any
+
+from strandssolver.dfs import dfsvisitor, dfsdepth
+from strandssolver.dfs.dfsaction import DFSAction
+from strandssolver.dfs.typing import Node, Edge
+
+
+def _bind_context(callback: Callable[..., Any], context: Dict[str, Any]
+                  ) -> Callable[[Any], Any]:
+    # Looks the context up on every call, so callbacks see its current state
+    return lambda argument: callback(argument, **context)
+
+
+def _dfs_edges_for_single_source_node(
+        start: Node, depth_limit: int,
+        visited: Set[Node], completed: Set[Node],
+        get_children: Callable[[Node], Iterable[Node]],
+        dfs_visitor: dfsvisitor.DFSVisitor,
+        context: Optional[Dict[str, Any]]) -> Iterable[Edge]:
+    """
+    Runs the search from one source node on a single explicit stack.
+    :return: (as generator return value) whether the visitor stopped the
+    search
+    """
+    discover_vertex = dfs_visitor.discover_vertex
+    finish_vertex = dfs_visitor.finish_vertex
+    tree_edge = dfs_visitor.tree_edge
+    back_edge = dfs_visitor.back_edge
+    forward_or_cross_edge = dfs_visitor.forward_or_cross_edge
+    if context is not None:
+        discover_vertex = _bind_context(discover_vertex, context)
+        finish_vertex = _bind_context(finish_vertex, context)
+        tree_edge = _bind_context(tree_edge, context)
+        back_edge = _bind_context(back_edge, context)
+        forward_or_cross_edge = _bind_context(forward_or_cross_edge, context)
+
+    depth = dfsdepth.Depth(depth_limit=depth_limit)
+    if context is not None:
+        context["dfs_depth"] = depth
+    stack: List[Tuple[Node, Iterable[Node]]] = [(start, get_children(start))]
+    if context is not None:
+        context["dfs_stack"] = stack
+
+    while stack:
+        parent, children = stack[-1]
+        if context is not None:
+            context["dfs_parent"] = parent
+            context["dfs_children"] = children
+
+        pruned = False
+        if parent not in visited:
+            visited.add(parent)
+            action = discover_vertex(parent)
+            if action is DFSAction.STOP_SEARCH:
+                return True
+            pruned = action is DFSAction.PRUNE_SEARCH
+
+        went_deeper = False
+        if not pruned:
+            for child in children:
+                edge = (parent, child)
+                if context is not None:
+                    context["dfs_edge"] = edge
+                # Black node?
+                if child in completed:
+                    action = forward_or_cross_edge(edge)
+                # Grey node?
+                elif child in visited:
+                    action = back_edge(edge)
+                # Then must be white node
+                else:
+                    action = tree_edge(edge)
+                    if action is DFSAction.PRUNE_SEARCH:
+                        continue
+                    if action is DFSAction.STOP_SEARCH:
+                        return True
+                    yield edge
+                    if depth.depth_now < depth_limit:
+                        stack.append((child, get_children(child)))
+                        depth.depth_now += 1
+                        went_deeper = True
+                        break
+                    continue
+                if action is DFSAction.STOP_SEARCH:
+                    return True
+        if went_deeper:
+            continue
+
+        completed.add(parent)
+        visited.remove(parent)
+        stack.pop()
+        depth.depth_now -= 1
+        action = finish_vertex(parent)
+        if action is DFSAction.REVISIT_VERTEX:
+            completed.remove(parent)
+        elif action is DFSAction.STOP_SEARCH:
+            return True
+    return False
+
+
+def dfs_edges(
+        G: nx.Graph, source: Node = None, depth_limit: int = None, *,
+        sort_neighbors: Callable[[Iterable[Node],
+                                  Optional[...]], Iterable[Node]] = None,
+        dfs_visitor: dfsvisitor.DFSVisitor = None,
+        pass_context: bool = False,
+        **kwargs) -> Iterable[Edge]:
+    """
+    Drop-in replacement for depthfirstsearch.dfs_edges that yields the same
+    edges and makes the same visitor calls in the same order.
+    Visitors steer the search with DFSAction return codes instead of
+    exceptions, and the search state lives on one stack instead of nested
+    generators.
+    :param G: graph to search
+    :param source: node to start from, all nodes if None
+    :param depth_limit: maximum number of nodes on a path
+    :param sort_neighbors: ordering of the children of a node
+    :param dfs_visitor: visitor receiving the search callbacks
+    :param pass_context: whether callbacks and sort_neighbors receive the
+    search state as keyword arguments (dfs_G, dfs_stack, dfs_visited, ...)
+    plus any extra kwargs, like depthfirstsearch.dfs_edges always does
+    :return: iterator over the tree edges
+    """
+    if source is None:
+        # edges for all components
+        nodes = G
+    else:
+        # edges for components with source
+        nodes = [source]
+    if depth_limit is None:
+        depth_limit = len(G)
+    if dfs_visitor is None:
+        dfs_visitor = dfsvisitor.IdleDFSVisitor()
+    if sort_neighbors is None:
+        sort_neighbors = dfs_visitor.sort_neighbors
+
+    # White := nodes that are neither in visited nor in completed
+    visited = set()  # gray
+    completed = set()  # black
+
+    if pass_context:
+        context = kwargs
+        context["dfs_nodes"] = nodes
+        context["dfs_depth_limt"] = depth_limit
+        context["dfs_sort_neighbors"] = sort_neighbors
+        context["dfs_G"] = G
+        context["dfs_visited"] = visited
+        context["dfs_completed"] = completed
+
+        def get_children(n: Node) -> Iterable[Node]:
+            return iter(sort_neighbors(G.neighbors(n), **context))
+
+        context["dfs_get_children"] = get_children
+    else:
+        context = None
+
+        def get_children(n: Node) -> Iterable[Node]:
+            return iter(sort_neighbors(G.neighbors(n)))
+
+    for start in nodes:
+        if start in visited:
+            continue
+        stopped = yield from _dfs_edges_for_single_source_node(
+            start=start, depth_limit=depth_limit,
+            visited=visited, completed=completed,
+            get_children=get_children,
+            dfs_visitor=dfs_visitor, context=context
+        )
+        if stopped:
+            return
+
+
+def _test() -> None:
+    from strandssolver.test.stubs import stubgraph
+    from strandssolver.dfs import depthfirstsearch
+    g = stubgraph.StubGraphBuilder.build_small_graph()
+    depth_limit = 4
+    original = list(depthfirstsearch.dfs_edges(g, depth_limit=depth_limit))
+    iterative = list(dfs_edges(g, depth_limit=depth_limit))
+    print(original == iterative)
+    print(set(nx.dfs_edges(g, depth_limit=depth_limit)) == set(iterative))
+
+
+if __name__ == "__main__":
+    _test()
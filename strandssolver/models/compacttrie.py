@@ -0,0 +1,384 @@
+import array
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+from typing import Iterable, Iterator, List, Sequence, Tuple, BinaryIO
+
+
+class UnsortedWordsError(ValueError):
+    pass
+
+
+class CompactTrie:
+    """
+    Read-only character trie stored in flat arrays.
+    States are node indices. The children of a node are stored
+    contiguously, ordered by the bit their character occupies in the
+    node's child mask, so stepping to a child is a popcount:
+        child = first_child[state] + popcount(mask & ((1 << bit) - 1))
+    A state is -1 when no key continues with the given character.
+    """
+    NO_STATE = -1
+    MAX_ALPHABET_SIZE = 64
+    MASK_TYPECODE = 'Q'
+    INDEX_TYPECODE = 'I'
+
+    def __init__(self, alphabet: str,
+                 child_masks: Sequence[int],
+                 first_child: Sequence[int],
+                 terminals: Sequence[int],
+                 root: int,
+                 number_of_words: int) -> None:
+        if len(alphabet) > CompactTrie.MAX_ALPHABET_SIZE:
+            raise ValueError(f"Alphabet has {len(alphabet)} characters but "
+                             f"at most {CompactTrie.MAX_ALPHABET_SIZE} fit "
+                             "into a child mask.")
+        self.alphabet = alphabet
+        self.child_masks = child_masks
+        self.first_child = first_child
+        self.terminals = terminals
+        self.root = root
+        self.number_of_words = number_of_words
+        # Set when the buffers are views into a memory-mapped binary file
+        self.path = None
+        self.checksum = None
+        self._mapping = None
+        self._bit_per_character = {character: bit
+                                   for bit, character in enumerate(alphabet)}
+
+    def __reduce__(self) -> Tuple:
+        # Memory-mapped tries are reopened from their file when unpickled,
+        # e.g. in pool workers, so processes share the mapped pages instead
+        # of each receiving a copy
+        if self.path is not None:
+            return CompactTrieBinaryFormat.open, (self.path, False)
+        return CompactTrie, (self.alphabet,
+                             array.array(CompactTrie.MASK_TYPECODE,
+                                         self.child_masks),
+                             array.array(CompactTrie.INDEX_TYPECODE,
+                                         self.first_child),
+                             bytes(self.terminals),
+                             self.root,
+                             self.number_of_words)
+
+    @property
+    def number_of_nodes(self) -> int:
+        return len(self.child_masks)
+
+    def step(self, state: int, character: str) -> int:
+        bit = self._bit_per_character.get(character)
+        if bit is None:
+            return CompactTrie.NO_STATE
+        mask = self.child_masks[state]
+        if not mask >> bit & 1:
+            return CompactTrie.NO_STATE
+        return self.first_child[state] + (mask & ((1 << bit) - 1)).bit_count()
+
+    def walk(self, key: str, state: int = None) -> int:
+        if state is None:
+            state = self.root
+        for character in key:
+            state = self.step(state, character)
+            if state < 0:
+                break
+        return state
+
+    def is_word(self, state: int) -> bool:
+        return bool(self.terminals[state >> 3] >> (state & 7) & 1)
+
+    def has_children(self, state: int) -> bool:
+        return self.child_masks[state] != 0
+
+    def has_key(self, key: str) -> bool:
+        state = self.walk(key)
+        return state >= 0 and self.is_word(state)
+
+    def has_subtrie(self, key: str) -> bool:
+        # Same meaning as pygtrie: key is a strict prefix of another key
+        state = self.walk(key)
+        return state >= 0 and self.has_children(state)
+
+    def __contains__(self, key: str) -> bool:
+        return self.has_key(key)
+
+    def __len__(self) -> int:
+        return self.number_of_words
+
+    def __iter__(self) -> Iterator[str]:
+        return self.keys()
+
+    def keys(self) -> Iterator[str]:
+        characters_in_order = sorted(self._bit_per_character.items())
+        stack: List[Tuple[int, str]] = [(self.root, "")]
+        while stack:
+            state, prefix = stack.pop()
+            if self.is_word(state):
+                yield prefix
+            mask = self.child_masks[state]
+            # Push in reverse so keys come out in lexicographic order
+            for character, bit in reversed(characters_in_order):
+                if mask >> bit & 1:
+                    child = self.first_child[state] + (
+                            mask & ((1 << bit) - 1)).bit_count()
+                    stack.append((child, prefix + character))
+
+    def nbytes(self) -> int:
+        return sum(memoryview(buffer).nbytes
+                   for buffer in (self.child_masks, self.first_child,
+                                  self.terminals))
+
+
+class CompactTrieBinaryFormat:
+    """
+    On-disk layout of a CompactTrie, all integers little-endian:
+        header:  magic, version, alphabet size in bytes, number of nodes,
+                 root, number of words, CRC-32 of everything after the header
+        payload: UTF-8 alphabet, child masks (u64), first children (u32),
+                 terminal bitmap
+    Every payload section starts on an 8 byte boundary so the arrays can be
+    used in place from a memory map.
+    """
+    MAGIC = b"SSTRIE\x00\x00"
+    VERSION = 1
+    HEADER = struct.Struct("<8s6I")
+    ALIGNMENT = 8
+
+    @staticmethod
+    def _padding(size: int) -> int:
+        return -size % CompactTrieBinaryFormat.ALIGNMENT
+
+    @staticmethod
+    def _little_endian(buffer: Sequence[int], typecode: str) -> memoryview:
+        view = memoryview(buffer).cast('B')
+        if sys.byteorder == 'little':
+            return view
+        swapped = array.array(typecode)
+        swapped.frombytes(view)
+        swapped.byteswap()
+        return memoryview(swapped).cast('B')
+
+    @staticmethod
+    def write(trie: CompactTrie, f: BinaryIO) -> int:
+        """
+        Writes the trie to a seekable binary file.
+        :param trie: trie to write
+        :param f: file opened for binary writing
+        :return: CRC-32 of the payload
+        """
+        alphabet = trie.alphabet.encode('utf-8')
+        number_of_nodes = trie.number_of_nodes
+        sections = [
+            alphabet,
+            CompactTrieBinaryFormat._little_endian(
+                trie.child_masks, CompactTrie.MASK_TYPECODE),
+            CompactTrieBinaryFormat._little_endian(
+                trie.first_child, CompactTrie.INDEX_TYPECODE),
+            memoryview(trie.terminals).cast('B'),
+        ]
+
+        header_position = f.tell()
+        f.write(bytes(CompactTrieBinaryFormat.HEADER.size))
+        checksum = 0
+        for section in sections:
+            padding = bytes(CompactTrieBinaryFormat._padding(len(section)))
+            for chunk in (section, padding):
+                checksum = zlib.crc32(chunk, checksum)
+                f.write(chunk)
+        end_position = f.tell()
+
+        f.seek(header_position)
+        f.write(CompactTrieBinaryFormat.HEADER.pack(
+            CompactTrieBinaryFormat.MAGIC,
+            CompactTrieBinaryFormat.VERSION,
+            len(alphabet),
+            number_of_nodes,
+            trie.root,
+            trie.number_of_words,
+            checksum,
+        ))
+        f.seek(end_position)
+        return checksum
+
+    @staticmethod
+    def open(path: str | bytes | os.PathLike,
+             verify_checksum: bool = True) -> CompactTrie:
+        """
+        Opens a binary trie without deserialising it: the arrays of the
+        returned trie are views into a read-only memory map, so processes
+        opening the same file share its pages.
+        :param path: path of a file written by CompactTrieBinaryFormat.write
+        :param verify_checksum: whether to check the payload CRC-32 first
+        :return: memory-mapped trie
+        """
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapping)
+        header = CompactTrieBinaryFormat.HEADER
+        if len(view) < header.size:
+            raise ValueError(f'"{path}" is too short to be a binary trie.')
+        (magic, version, alphabet_size, number_of_nodes, root,
+         number_of_words, checksum) = header.unpack_from(view)
+        if magic != CompactTrieBinaryFormat.MAGIC:
+            raise ValueError(f'"{path}" is not a binary trie.')
+        if version != CompactTrieBinaryFormat.VERSION:
+            raise ValueError(f'"{path}" has binary trie version {version} '
+                             'but only version '
+                             f'{CompactTrieBinaryFormat.VERSION} '
+                             'is supported.')
+        if verify_checksum and zlib.crc32(view[header.size:]) != checksum:
+            raise ValueError(f'Checksum mismatch in "{path}", '
+                             'the file is corrupt.')
+
+        sizes = [
+            alphabet_size,
+            8 * number_of_nodes,
+            4 * number_of_nodes,
+            (number_of_nodes + 7) // 8,
+        ]
+        sections = []
+        offset = header.size
+        for size in sizes:
+            sections.append(view[offset:offset + size])
+            offset += size + CompactTrieBinaryFormat._padding(size)
+        if offset > len(view):
+            raise ValueError(f'"{path}" is truncated.')
+        alphabet, child_masks, first_child, terminals = sections
+
+        child_masks = CompactTrieBinaryFormat._native(
+            child_masks, CompactTrie.MASK_TYPECODE)
+        first_child = CompactTrieBinaryFormat._native(
+            first_child, CompactTrie.INDEX_TYPECODE)
+        trie = CompactTrie(alphabet=str(alphabet, 'utf-8'),
+                           child_masks=child_masks,
+                           first_child=first_child,
+                           terminals=terminals,
+                           root=root,
+                           number_of_words=number_of_words)
+        trie.path = os.path.abspath(os.fsdecode(path))
+        trie.checksum = checksum
+        trie._mapping = mapping
+        return trie
+
+    @staticmethod
+    def _native(view: memoryview, typecode: str) -> Sequence[int]:
+        if sys.byteorder == 'little':
+            return view.cast(typecode)
+        # Big-endian hosts pay for one copy instead of mapping in place
+        values = array.array(typecode)
+        values.frombytes(view)
+        values.byteswap()
+        return values
+
+
+class CompactTrieBuilder:
+    @staticmethod
+    def build_from_sorted_words(words: Iterable[str]) -> CompactTrie:
+        """
+        Builds the trie in one pass over lexicographically sorted words.
+        A node's children get their indices when the node is closed, i.e.
+        when the input moves past its prefix, so only the current path is
+        kept open and the root ends up as the last node.
+        :param words: sorted words, duplicates are skipped
+        :return: compact trie containing the words
+        """
+        bit_per_character = {}
+        child_masks = array.array(CompactTrie.MASK_TYPECODE)
+        first_child = array.array(CompactTrie.INDEX_TYPECODE)
+        terminal_flags = bytearray()
+        # Open nodes along the current word: [character, terminal, children]
+        # where children are closed (bit, mask, first child, terminal) tuples
+        stack = [["", False, []]]
+        previous = None
+        number_of_words = 0
+
+        def close_children(node: list) -> Tuple[int, int]:
+            children = sorted(node[2])
+            first = len(child_masks)
+            mask = 0
+            for bit, child_mask, child_first, terminal in children:
+                mask |= 1 << bit
+                child_masks.append(child_mask)
+                first_child.append(child_first)
+                terminal_flags.append(terminal)
+            return mask, first
+
+        def close_top() -> None:
+            node = stack.pop()
+            mask, first = close_children(node)
+            stack[-1][2].append((bit_per_character[node[0]], mask, first,
+                                 node[1]))
+
+        for word in words:
+            if previous is not None:
+                if word == previous:
+                    continue
+                if word < previous:
+                    raise UnsortedWordsError(
+                        f'Words must be sorted but "{word}" came after '
+                        f'"{previous}".')
+            common = 0
+            if previous is not None:
+                for a, b in zip(previous, word):
+                    if a != b:
+                        break
+                    common += 1
+            while len(stack) > common + 1:
+                close_top()
+            for character in word[common:]:
+                if character not in bit_per_character:
+                    bit = len(bit_per_character)
+                    if bit >= CompactTrie.MAX_ALPHABET_SIZE:
+                        raise ValueError(
+                            "Words use more than "
+                            f"{CompactTrie.MAX_ALPHABET_SIZE} distinct "
+                            "characters.")
+                    bit_per_character[character] = bit
+                stack.append([character, False, []])
+            stack[-1][1] = True
+            number_of_words += 1
+            previous = word
+
+        while len(stack) > 1:
+            close_top()
+        root_mask, root_first = close_children(stack[0])
+        root = len(child_masks)
+        child_masks.append(root_mask)
+        first_child.append(root_first)
+        terminal_flags.append(stack[0][1])
+
+        terminals = bytearray((len(terminal_flags) + 7) // 8)
+        for state, terminal in enumerate(terminal_flags):
+            if terminal:
+                terminals[state >> 3] |= 1 << (state & 7)
+
+        alphabet = "".join(sorted(bit_per_character,
+                                  key=bit_per_character.get))
+        return CompactTrie(alphabet=alphabet,
+                           child_masks=child_masks,
+                           first_child=first_child,
+                           terminals=terminals,
+                           root=root,
+                           number_of_words=number_of_words)
+
+    @staticmethod
+    def build_from_words(words: Iterable[str]) -> CompactTrie:
+        return CompactTrieBuilder.build_from_sorted_words(sorted(set(words)))
+
+
+def _test() -> None:
+    trie = CompactTrieBuilder.build_from_words(
+        ["strand", "strands", "stranded", "solve", "solver", "a"])
+    print(list(trie.keys()))
+    print(trie.has_key("strand"), trie.has_subtrie("strand"),
+          trie.has_key("stra"), trie.has_subtrie("solver"))
+    state = trie.root
+    for character in "solve":
+        state = trie.step(state, character)
+    print(trie.is_word(state), trie.step(state, "x"))
+
+
+if __name__ == "__main__":
+    _test()
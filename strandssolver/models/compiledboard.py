@@ -0,0 +1,120 @@
+import itertools
+import numpy as np
+
+from dataclasses import dataclass
+from typing import Tuple, Dict, Iterator
+
+from strandssolver.models import gamestate
+from strandssolver.dfs.typing import Node
+
+
+@dataclass(frozen=True)
+class CompiledBoard:
+    """
+    A board flattened for bitmask searches.
+    Cells are numbered in row-major order and bit i of a mask stands for
+    cell i, so any set of cells (e.g. the visited cells) fits in one int.
+    Solved cells are excluded from the active mask and from all
+    neighbour masks.
+    """
+    shape: Tuple[int, ...]
+    nodes: Tuple[Node, ...]
+    cell_id_per_node: Dict[Node, int]
+    letters: Tuple[str, ...]
+    neighbour_masks: Tuple[int, ...]
+    active_mask: int
+
+    @property
+    def number_of_cells(self) -> int:
+        return len(self.nodes)
+
+    def cell_id(self, node: Node) -> int:
+        return self.cell_id_per_node[node]
+
+    def is_active(self, cell: int) -> bool:
+        return bool(self.active_mask >> cell & 1)
+
+    def mask_from_nodes(self, nodes: Tuple[Node, ...]) -> int:
+        mask = 0
+        for node in nodes:
+            mask |= 1 << self.cell_id_per_node[node]
+        return mask
+
+    def nodes_from_cells(self, cells: Tuple[int, ...]) -> Tuple[Node, ...]:
+        return tuple(self.nodes[cell] for cell in cells)
+
+    @staticmethod
+    def cells_in_mask(mask: int) -> Iterator[int]:
+        while mask:
+            lowest_bit = mask & -mask
+            mask ^= lowest_bit
+            yield lowest_bit.bit_length() - 1
+
+
+class CompiledBoardBuilder:
+    @staticmethod
+    def build_compiled_board_from_board(board: gamestate.Board
+                                        ) -> CompiledBoard:
+        shape = tuple(int(length) for length in board.shape)
+        nodes = tuple(np.ndindex(shape))
+        cell_id_per_node = {node: cell for cell, node in enumerate(nodes)}
+        letters = tuple(str(character).lower()
+                        for character in board.characters.flat)
+
+        active_mask = 0
+        for cell, solved in enumerate(board.solved_states.flat):
+            if not solved:
+                active_mask |= 1 << cell
+
+        offsets = CompiledBoardBuilder.neighbour_offsets(len(shape))
+        neighbour_masks = []
+        for cell, node in enumerate(nodes):
+            mask = 0
+            if active_mask >> cell & 1:
+                for offset in offsets:
+                    neighbour = tuple(index + delta
+                                      for index, delta in zip(node, offset))
+                    if all(0 <= index < length
+                           for index, length in zip(neighbour, shape)):
+                        mask |= 1 << cell_id_per_node[neighbour]
+            neighbour_masks.append(mask & active_mask)
+
+        return CompiledBoard(shape=shape,
+                             nodes=nodes,
+                             cell_id_per_node=cell_id_per_node,
+                             letters=letters,
+                             neighbour_masks=tuple(neighbour_masks),
+                             active_mask=active_mask)
+
+    @staticmethod
+    def neighbour_offsets(number_of_dims: int) -> Tuple[Tuple[int, ...], ...]:
+        # Same neighbourhood as CharacterGraphBuilder: every cell within one
+        # step along each axis, diagonals included
+        return tuple(offset
+                     for offset in itertools.product((-1, 0, 1),
+                                                     repeat=number_of_dims)
+                     if any(offset))
+
+
+def _test() -> None:
+    from strandssolver.test.stubs import stubgamestate
+    from timeit import timeit
+
+    game = stubgamestate.StubGameState()
+    game.board.solved_states[[1, 2, 3], [1, 2, 3]] = True
+
+    loop = 1000
+    time = timeit(
+        lambda: CompiledBoardBuilder.build_compiled_board_from_board(
+            game.board),
+        number=loop
+    )
+    print(time / loop)
+    board = CompiledBoardBuilder.build_compiled_board_from_board(game.board)
+    for cell, mask in enumerate(board.neighbour_masks):
+        print(board.nodes[cell], board.letters[cell],
+              board.nodes_from_cells(tuple(board.cells_in_mask(mask))))
+
+
+if __name__ == "__main__":
+    _test()
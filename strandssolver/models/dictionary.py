@@ -1,7 +1,12 @@
+import contextlib
+import heapq
+import itertools
 import os
 import json
+import re
+import tempfile
 
-from typing import Iterable, Callable, Set
+from typing import Iterable, Iterator, Callable, Set
 from dataclasses import dataclass
 
 
@@ -22,7 +27,41 @@ class Dictionary:
                       if filter_condition(word)}
 
 
+class WordFile:
+    """
+    The words of a file, read again in chunks every time it is iterated,
+    so only a chunk and the current word are ever held in memory.
+    Files ending in .json hold a JSON object whose keys are the words,
+    e.g. {"strand": 1, ...}; all other files are word lists with one word
+    per line.
+    """
+    JSON_SUFFIX = ".json"
+
+    def __init__(self, path: str | bytes | os.PathLike,
+                 encoding: str = None, chunk_size: int = None) -> None:
+        self.path = path
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+
+    def __iter__(self) -> Iterator[str]:
+        if os.fsdecode(self.path).endswith(WordFile.JSON_SUFFIX):
+            return DictionaryBuilder.iter_keys_from_json(
+                self.path, self.encoding, self.chunk_size)
+        return DictionaryBuilder.iter_words_from_word_list(self.path,
+                                                           self.encoding)
+
+
 class DictionaryBuilder:
+    DEFAULT_ENCODING = 'utf-8'
+    DEFAULT_CHUNK_SIZE = 1 << 16
+    DEFAULT_RUN_SIZE = 1 << 17
+    _WHITESPACE = re.compile(r"\s*")
+    # A whole "key": scalar entry and the delimiter after it, the common
+    # case in dictionary files that skips the general decoding below
+    _SIMPLE_ENTRY = re.compile(r'\s*"((?:[^"\\]|\\.)*)"\s*:\s*'
+                               r'(?:-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?'
+                               r'|true|false|null)\s*([,}])')
+
     @staticmethod
     def load_keys_from_json(path: str | bytes | os.PathLike) -> Set[str]:
         with open(path, 'rb') as f:
@@ -30,6 +69,133 @@ class DictionaryBuilder:
             words = word_dict.keys()
             return words
 
+    @staticmethod
+    def iter_keys_from_json(path: str | bytes | os.PathLike,
+                            encoding: str = None,
+                            chunk_size: int = None) -> Iterator[str]:
+        """
+        Yields the keys of the JSON object in the file one at a time,
+        without decoding the whole file. Values are parsed and dropped.
+        """
+        if encoding is None:
+            encoding = DictionaryBuilder.DEFAULT_ENCODING
+        if chunk_size is None:
+            chunk_size = DictionaryBuilder.DEFAULT_CHUNK_SIZE
+        decoder = json.JSONDecoder()
+        skip_whitespace = DictionaryBuilder._WHITESPACE.match
+        simple_entry = DictionaryBuilder._SIMPLE_ENTRY.match
+        with open(path, 'r', encoding=encoding) as f:
+            buffer = ""
+            position = 0
+
+            def read_more() -> bool:
+                nonlocal buffer, position
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return False
+                buffer = buffer[position:] + chunk
+                position = 0
+                return True
+
+            def next_character() -> str:
+                nonlocal position
+                while True:
+                    position = skip_whitespace(buffer, position).end()
+                    if position < len(buffer):
+                        return buffer[position]
+                    if not read_more():
+                        raise ValueError(f'"{path}" ends before its JSON '
+                                         'object is closed.')
+
+            def decode_value() -> object:
+                nonlocal position
+                while True:
+                    try:
+                        value, end = decoder.raw_decode(buffer, position)
+                    except json.JSONDecodeError:
+                        # Value cut off by the end of the chunk
+                        if read_more():
+                            continue
+                        raise
+                    # Only trust the value once the next delimiter is in
+                    # the buffer, a number cut off by the end of the chunk
+                    # decodes fine but too short
+                    delimiter = skip_whitespace(buffer, end).end()
+                    if (delimiter == len(buffer)
+                            or buffer[delimiter] not in ",}:") \
+                            and read_more():
+                        continue
+                    position = end
+                    return value
+
+            def expect(characters: str) -> str:
+                nonlocal position
+                character = next_character()
+                if character not in characters:
+                    raise ValueError(f'Expected one of "{characters}" in '
+                                     f'"{path}" but found "{character}".')
+                position += 1
+                return character
+
+            expect("{")
+            if next_character() == "}":
+                return
+            while True:
+                match = simple_entry(buffer, position)
+                if match is not None:
+                    key = match.group(1)
+                    yield json.loads(f'"{key}"') if "\\" in key else key
+                    position = match.end()
+                    if match.group(2) == "}":
+                        return
+                    continue
+                if next_character() != '"':
+                    raise ValueError(f'Expected a key in "{path}" but found '
+                                     f'"{next_character()}".')
+                yield decode_value()
+                expect(":")
+                next_character()
+                decode_value()
+                if expect(",}") == "}":
+                    return
+
+    @staticmethod
+    def iter_words_from_word_list(path: str | bytes | os.PathLike,
+                                  encoding: str = None) -> Iterator[str]:
+        if encoding is None:
+            encoding = DictionaryBuilder.DEFAULT_ENCODING
+        with open(path, 'r', encoding=encoding) as f:
+            for line in f:
+                word = line.strip()
+                if word:
+                    yield word
+
+    @staticmethod
+    def sort_words_externally(words: Iterable[str], run_size: int = None
+                              ) -> Iterator[str]:
+        """
+        Sorts words without holding all of them: runs of run_size words
+        are sorted into temporary files, which are then merged lazily.
+        Duplicates are dropped.
+        """
+        if run_size is None:
+            run_size = DictionaryBuilder.DEFAULT_RUN_SIZE
+        with tempfile.TemporaryDirectory() as directory, \
+                contextlib.ExitStack() as stack:
+            runs = []
+            for number, run in enumerate(itertools.batched(words, run_size)):
+                path = os.path.join(directory, f"run{number}.txt")
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.writelines(word + "\n" for word in sorted(set(run)))
+                run_file = stack.enter_context(
+                    open(path, 'r', encoding='utf-8'))
+                runs.append(line[:-1] for line in run_file)
+            previous = None
+            for word in heapq.merge(*runs):
+                if word != previous:
+                    yield word
+                    previous = word
+
     @staticmethod
     def build_dictionary_from_json(
             path: str | bytes | os.PathLike,
@@ -39,6 +205,23 @@ class DictionaryBuilder:
         dictionary = Dictionary(words, filter_condition)
         return dictionary
 
+    @staticmethod
+    def stream_dictionary_from_file(
+            path: str | bytes | os.PathLike,
+            filter_condition: Callable[[str], bool] = None,
+            encoding: str = None
+    ) -> Dictionary:
+        """
+        Like build_dictionary_from_json, but the words stay in the file and
+        are filtered while they are read, for JSON and word list files.
+        Calling drop_filtered_words on it loads the remaining words after
+        all.
+        """
+        dictionary = Dictionary(WordFile(path, encoding))
+        if filter_condition is not None:
+            dictionary.filter_condition = filter_condition
+        return dictionary
+
 
 def _test() -> None:
     from importlib import resources
@@ -54,6 +237,10 @@ def _test() -> None:
     print(dictionary)
     for word in dictionary.words:
         print(word, end=", ")
+    print()
+    streamed = DictionaryBuilder.stream_dictionary_from_file(
+        word_dict_json, lambda word: len(word) >= 20)
+    print(sorted(streamed) == sorted(dictionary.words))
 
 
 if __name__ == "__main__":
@@ -1,10 +1,12 @@
 import pygtrie
 import os
 import json
+import argparse
 
-from typing import Type
+from typing import Type, List, Callable
 
-from strandssolver.models.dictionary import Dictionary
+from strandssolver.models import compacttrie
+from strandssolver.models.dictionary import Dictionary, DictionaryBuilder
 
 
 class DictionaryTrieBuilder:
@@ -19,6 +21,39 @@ class DictionaryTrieBuilder:
             trie[word] = True
         return trie
 
+    @staticmethod
+    def build_compact_trie_from_dictionary(dictionary: Dictionary
+                                           ) -> compacttrie.CompactTrie:
+        return compacttrie.CompactTrieBuilder.build_from_words(dictionary)
+
+    @staticmethod
+    def build_compact_trie_from_file(path: str | bytes | os.PathLike,
+                                     filter_condition: Callable[[str], bool]
+                                     = None,
+                                     encoding: str = None
+                                     ) -> compacttrie.CompactTrie:
+        """
+        Streams the words of a JSON or word list file into a CompactTrie
+        without ever holding the whole word list. Sorted files are built in
+        a single pass; otherwise the words are read a second time through
+        an external merge sort.
+        """
+        dictionary = DictionaryBuilder.stream_dictionary_from_file(
+            path, filter_condition, encoding)
+        try:
+            return compacttrie.CompactTrieBuilder.build_from_sorted_words(
+                dictionary)
+        except compacttrie.UnsortedWordsError:
+            pass
+        return compacttrie.CompactTrieBuilder.build_from_sorted_words(
+            DictionaryBuilder.sort_words_externally(dictionary))
+
+    @staticmethod
+    def compact_trie_from_trie(trie: pygtrie.Trie) -> compacttrie.CompactTrie:
+        # pygtrie.Trie yields keys as tuples of characters, CharTrie as str
+        words = ("".join(key) for key in trie.keys())
+        return compacttrie.CompactTrieBuilder.build_from_words(words)
+
     @staticmethod
     def store_trie_as_json(trie: pygtrie.Trie,
                            path: str | bytes | os.PathLike,
@@ -45,13 +80,66 @@ class DictionaryTrieBuilder:
             trie_dict = json.load(f)
             return cast_to(trie_dict)
 
+    @staticmethod
+    def store_trie_as_binary(trie: pygtrie.Trie | compacttrie.CompactTrie,
+                             path: str | bytes | os.PathLike
+                             ) -> None:
+        if not isinstance(trie, compacttrie.CompactTrie):
+            trie = DictionaryTrieBuilder.compact_trie_from_trie(trie)
+        with open(path, 'wb') as f:
+            compacttrie.CompactTrieBinaryFormat.write(trie, f)
+
+    @staticmethod
+    def load_trie_from_binary(path: str | bytes | os.PathLike,
+                              verify_checksum: bool = True
+                              ) -> compacttrie.CompactTrie:
+        return compacttrie.CompactTrieBinaryFormat.open(
+            path, verify_checksum=verify_checksum)
+
+    @staticmethod
+    def convert_json_to_binary(json_path: str | bytes | os.PathLike,
+                               binary_path: str | bytes | os.PathLike,
+                               encoding: str = DEFAULT_JSON_ENCODING
+                               ) -> None:
+        trie = DictionaryTrieBuilder.build_compact_trie_from_file(
+            json_path, encoding=encoding)
+        DictionaryTrieBuilder.store_trie_as_binary(trie, binary_path)
+
 
 def _test() -> None:
+    import tracemalloc
     from strandssolver.test.stubs import stubdictionary
     dictionary = stubdictionary.StubDictionary()
+
+    tracemalloc.start()
     trie = DictionaryTrieBuilder.build_trie_from_dictionary(dictionary)
-    print(trie)
+    pygtrie_bytes, _ = tracemalloc.get_traced_memory()
+    del trie
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    compact = DictionaryTrieBuilder.build_compact_trie_from_dictionary(
+        dictionary)
+    compact_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    print(f"pygtrie: {pygtrie_bytes / 2 ** 20:.1f} MiB, "
+          f"compact: {compact_bytes / 2 ** 20:.1f} MiB "
+          f"({compact.number_of_nodes} nodes, {len(compact)} words)")
+
+
+def main(arguments: List[str] = None) -> None:
+    from strandssolver.test.data import filepaths
+    argument_parser = argparse.ArgumentParser(
+        description="Convert a JSON word trie, or any JSON object or word "
+                    "list file of words, into the binary trie format.")
+    argument_parser.add_argument("json_path", nargs="?",
+                                 default=filepaths.words_trie_path)
+    argument_parser.add_argument("binary_path", nargs="?",
+                                 default=filepaths.words_trie_binary_path)
+    parsed = argument_parser.parse_args(arguments)
+    DictionaryTrieBuilder.convert_json_to_binary(parsed.json_path,
+                                                 parsed.binary_path)
 
 
 if __name__ == "__main__":
-    _test()
+    main()
@@ -1,6 +1,5 @@
 import networkx as nx
 import numpy as np
-from matplotlib import pyplot as plt
 import functools
 import numpy.typing
 
@@ -90,6 +89,7 @@ class CharacterGraphBuilder:
 
 
 def _test() -> None:
+    from matplotlib import pyplot as plt
     from strandssolver.test.stubs import stubgamestate
     from timeit import timeit
 
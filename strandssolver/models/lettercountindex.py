@@ -0,0 +1,232 @@
+import argparse
+import os
+import numpy as np
+import numpy.typing
+import pygtrie
+
+from typing import Iterable, List, Sequence
+
+from strandssolver.models import gamestate, compacttrie
+
+
+class LetterCountIndex:
+    """
+    Letter histogram of every word in a dictionary, one row per word.
+    A word can only be spelled on a board if no letter occurs in it more
+    often than among the board's unsolved cells, so the words a board can
+    possibly contain are found with a few vectorised comparisons. A bitmask
+    of the letters in each word rules out most words before their counts
+    are compared.
+    Words are kept sorted, so any selection of them goes straight into
+    CompactTrieBuilder.build_from_sorted_words.
+    """
+    # Strands theme words have at least four letters
+    MIN_WORD_LENGTH = 4
+    COUNT_DTYPE = np.uint8
+    MASK_DTYPE = np.uint64
+
+    def __init__(self, alphabet: str, words: Sequence[str],
+                 counts: np.typing.NDArray[np.uint8],
+                 letter_masks: np.typing.NDArray[np.uint64]) -> None:
+        """
+        :param alphabet: character of every column of counts
+        :param words: sorted words
+        :param counts: (number of words x alphabet size) letter counts
+        :param letter_masks: bit i is set if the word contains alphabet[i]
+        """
+        if len(alphabet) > compacttrie.CompactTrie.MAX_ALPHABET_SIZE:
+            raise ValueError(f"Alphabet has {len(alphabet)} characters but "
+                             "at most "
+                             f"{compacttrie.CompactTrie.MAX_ALPHABET_SIZE} "
+                             "fit into a letter mask.")
+        self.alphabet = alphabet
+        self.words = words
+        self.counts = counts
+        self.letter_masks = letter_masks
+        self.lengths = counts.sum(axis=1, dtype=np.int64)
+        self._column_per_character = {character: column
+                                      for column, character
+                                      in enumerate(alphabet)}
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def board_counts(self, board: gamestate.Board
+                     ) -> np.typing.NDArray[np.int64]:
+        """
+        :return: count of every alphabet character among the unsolved
+        cells, letters outside the alphabet are left out
+        """
+        counts = np.zeros(len(self.alphabet), dtype=np.int64)
+        unsolved = board.characters[~board.solved_states.astype(bool)]
+        for character in unsolved.flat:
+            column = self._column_per_character.get(str(character).lower())
+            if column is not None:
+                counts[column] += 1
+        return counts
+
+    def fitting_words(self, counts: np.typing.ArrayLike,
+                      min_length: int = None, max_length: int = None
+                      ) -> List[str]:
+        """
+        :param counts: available count of every alphabet character
+        :return: sorted words whose letters all fit within counts
+        """
+        if min_length is None:
+            min_length = LetterCountIndex.MIN_WORD_LENGTH
+        counts = np.asarray(counts)
+        available_mask = 0
+        for column in np.flatnonzero(counts):
+            available_mask |= 1 << int(column)
+
+        selected = (self.letter_masks
+                    & self.MASK_DTYPE(~available_mask
+                                      & (1 << len(self.alphabet)) - 1)) == 0
+        selected &= self.lengths >= min_length
+        if max_length is not None:
+            selected &= self.lengths <= max_length
+        rows = np.flatnonzero(selected)
+        fits = np.all(self.counts[rows] <= counts, axis=1)
+        return [self.words[row] for row in rows[fits]]
+
+    def words_for_board(self, board: gamestate.Board,
+                        min_length: int = None, max_length: int = None
+                        ) -> List[str]:
+        """
+        :param max_length: e.g. the search depth limit, at most the number
+        of unsolved cells
+        """
+        counts = self.board_counts(board)
+        number_of_letters = int(counts.sum())
+        if max_length is None or max_length > number_of_letters:
+            max_length = number_of_letters
+        return self.fitting_words(counts, min_length, max_length)
+
+    def build_board_trie(self, board: gamestate.Board,
+                         min_length: int = None, max_length: int = None
+                         ) -> compacttrie.CompactTrie:
+        """
+        :return: trie of only the words the board's letters can spell,
+        usually a few thousand instead of the whole dictionary
+        """
+        return compacttrie.CompactTrieBuilder.build_from_sorted_words(
+            self.words_for_board(board, min_length, max_length))
+
+
+class LetterCountIndexBuilder:
+    WORD_SEPARATOR = "\n"
+
+    @staticmethod
+    def build_from_sorted_words(words: Iterable[str]) -> LetterCountIndex:
+        """
+        :param words: sorted words without duplicates
+        """
+        words = list(words)
+        alphabet = "".join(sorted(set().union(*words)))
+        column_per_character = {character: column
+                                for column, character in enumerate(alphabet)}
+        lengths = np.fromiter((len(word) for word in words), dtype=np.int64,
+                              count=len(words))
+        columns = np.fromiter(
+            (column_per_character[character]
+             for word in words for character in word),
+            dtype=np.int64, count=int(lengths.sum()))
+        rows = np.repeat(np.arange(len(words)), lengths)
+        counts = np.bincount(rows * len(alphabet) + columns,
+                             minlength=len(words) * len(alphabet))
+        counts = counts.reshape(len(words), len(alphabet))
+        counts = np.minimum(counts, np.iinfo(
+            LetterCountIndex.COUNT_DTYPE).max).astype(
+            LetterCountIndex.COUNT_DTYPE)
+
+        letter_masks = np.zeros(len(words), dtype=LetterCountIndex.MASK_DTYPE)
+        for column in range(len(alphabet)):
+            letter_masks |= (counts[:, column] > 0).astype(
+                LetterCountIndex.MASK_DTYPE) << LetterCountIndex.MASK_DTYPE(
+                column)
+        return LetterCountIndex(alphabet, words, counts, letter_masks)
+
+    @staticmethod
+    def build_from_words(words: Iterable[str]) -> LetterCountIndex:
+        return LetterCountIndexBuilder.build_from_sorted_words(
+            sorted(set(words)))
+
+    @staticmethod
+    def build_from_trie(trie: pygtrie.Trie | compacttrie.CompactTrie
+                        ) -> LetterCountIndex:
+        # pygtrie.Trie yields keys as tuples of characters, CharTrie as str
+        return LetterCountIndexBuilder.build_from_words(
+            "".join(key) for key in trie.keys())
+
+    @staticmethod
+    def store(index: LetterCountIndex,
+              path: str | bytes | os.PathLike) -> None:
+        words = LetterCountIndexBuilder.WORD_SEPARATOR.join(index.words)
+        with open(path, 'wb') as f:
+            np.savez(f,
+                     alphabet=np.array(index.alphabet),
+                     words=np.frombuffer(words.encode('utf-8'),
+                                         dtype=np.uint8),
+                     counts=index.counts,
+                     letter_masks=index.letter_masks)
+
+    @staticmethod
+    def load(path: str | bytes | os.PathLike) -> LetterCountIndex:
+        with np.load(path) as arrays:
+            words = arrays["words"].tobytes().decode('utf-8')
+            words = words.split(LetterCountIndexBuilder.WORD_SEPARATOR) \
+                if words else []
+            return LetterCountIndex(alphabet=str(arrays["alphabet"]),
+                                    words=words,
+                                    counts=arrays["counts"],
+                                    letter_masks=arrays["letter_masks"])
+
+
+def _test() -> None:
+    import tempfile
+    from timeit import timeit
+    from strandssolver.test.stubs import stubgamestate
+
+    game = stubgamestate.StubSmallGameState()
+    index = LetterCountIndexBuilder.build_from_words(
+        ["kern", "kernel", "tent", "tents", "rite", "rites", "mite", "miter",
+         "gut", "guts", "omit", "omits", "note", "notes", "tint", "unit",
+         "kitten", "zebra"])
+    print(index.words_for_board(game.board))
+    print(list(index.build_board_trie(game.board, max_length=8).keys()))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "index.npz")
+        LetterCountIndexBuilder.store(index, path)
+        loaded = LetterCountIndexBuilder.load(path)
+        print(loaded.words_for_board(game.board) ==
+              index.words_for_board(game.board))
+    loop = 1000
+    print(timeit(lambda: index.build_board_trie(game.board),
+                 number=loop) / loop)
+
+
+def main(arguments: List[str] = None) -> None:
+    from strandssolver.models import dictionarytrie
+    from strandssolver.test.data import filepaths
+    argument_parser = argparse.ArgumentParser(
+        description="Precompute the letter count index of a word trie.")
+    argument_parser.add_argument("trie_path", nargs="?",
+                                 default=filepaths.words_trie_binary_path,
+                                 help="binary or JSON word trie")
+    argument_parser.add_argument(
+        "index_path", nargs="?",
+        default=filepaths.words_letter_count_index_path)
+    parsed = argument_parser.parse_args(arguments)
+    if os.fspath(parsed.trie_path).endswith(".json"):
+        trie = dictionarytrie.DictionaryTrieBuilder.load_trie_from_json(
+            parsed.trie_path)
+    else:
+        trie = dictionarytrie.DictionaryTrieBuilder.load_trie_from_binary(
+            parsed.trie_path)
+    index = LetterCountIndexBuilder.build_from_trie(trie)
+    LetterCountIndexBuilder.store(index, parsed.index_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,46 @@
-import bs4
+from __future__ import annotations
 
-from typing import Tuple, override
+import lxml.etree
+import lxml.html
+
+from typing import Tuple, List, override, TYPE_CHECKING
 
 from strandssolver.models import gamestate
 from strandssolver.parsers import parser
-from strandssolver.readers import reader, htmlreader
+from strandssolver.readers import reader
+
+if TYPE_CHECKING:
+    import bs4
 
 
 class HTMLParser(parser.Parser):
+    """
+    By default the board, theme and word counts are read with XPath on an
+    lxml tree, which is far cheaper than building the BeautifulSoup tree
+    of the whole page. The soup is only built if that fails, or always
+    with fast=False.
+    """
+    BOARD_CLASS = "UOpmtW_board"
+    BUTTON_CLASS = "pRjvKq_item"
+    THEME_CLASS = "umfyna_clue"
+    HINT_ID = "hint"
+
     def __init__(self,
                  html: str = None,
-                 html_reader: reader.Reader = None
+                 html_reader: reader.Reader = None,
+                 fast: bool = True
                  ) -> None:
-        if html_reader is None:
+        # Only start a browser when there is no html to parse yet
+        if html_reader is None and html is None:
+            # Imported here, parsing given html never needs selenium
+            from strandssolver.readers import htmlreader
             html_reader = htmlreader.HTMLReader()
         self.html_reader = html_reader
         if html is None:
             html = self.html_reader.read()
+        self.fast = fast
         self._html = None
+        self._soup = None
         self.html = html
 
     @property
@@ -27,13 +50,32 @@ class HTMLParser(parser.Parser):
     @html.setter
     def html(self, html: str) -> None:
         self._html = html
-        self.soup = bs4.BeautifulSoup(self.html, 'lxml')
+        self._soup = None
+
+    @property
+    def soup(self) -> bs4.BeautifulSoup:
+        if self._soup is None:
+            import bs4
+            self._soup = bs4.BeautifulSoup(self.html, 'lxml')
+        return self._soup
 
     @override
     def parse(self) -> gamestate.GameState:
+        if self.fast:
+            try:
+                return self._parse_fast()
+            except (AttributeError, IndexError, ValueError,
+                    lxml.etree.LxmlError):
+                # Unexpected markup, let the soup path have a go
+                pass
         theme = self._parse_theme()
         solved_words, total_words = self._parse_word_counts()
         board = self._parse_board()
+        return self._game_state(board, theme, solved_words, total_words)
+
+    @staticmethod
+    def _game_state(board: gamestate.Board, theme: str, solved_words: int,
+                    total_words: int) -> gamestate.GameState:
         game_state = gamestate.GameState(
             board=board,
             theme=theme,
@@ -63,14 +105,21 @@ class HTMLParser(parser.Parser):
            </div>
         </div>
         '''
-        board = self.soup.find("div", attrs={"class": 'UOpmtW_board'})
-        buttons = board.findAll("button", attrs={"class": 'pRjvKq_item'})
+        board = self.soup.find("div",
+                               attrs={"class": HTMLParser.BOARD_CLASS})
+        buttons = board.findAll("button",
+                                attrs={"class": HTMLParser.BUTTON_CLASS})
 
         letters = []
         for button in buttons:
             index = int(button.attrs["id"].strip("button-"))
             letter = button.text
             letters.append((index, letter))
+        return self._board_from_letters(letters)
+
+    @staticmethod
+    def _board_from_letters(letters: List[Tuple[int, str]]
+                            ) -> gamestate.Board:
         letters = sorted(letters, key=lambda tup: tup[0])
         letters = [letter for _, letter in letters]
 
@@ -80,7 +129,7 @@ class HTMLParser(parser.Parser):
 
     def _parse_theme(self) -> str:
         # <h1 class="umfyna_clue">theme</h1>
-        theme = self.soup.find('h1', attrs={'class': 'umfyna_clue'})
+        theme = self.soup.find('h1', attrs={'class': HTMLParser.THEME_CLASS})
         return theme.text
 
     def _parse_word_counts(self) -> Tuple[int, int]:
@@ -91,17 +140,55 @@ class HTMLParser(parser.Parser):
         #   </p>
         #   ...
         # </div>
-        hint = self.soup.find(id='hint')
+        hint = self.soup.find(id=HTMLParser.HINT_ID)
         paragraph = hint.find("p", recursive=False)
         solved = paragraph.find("b")
         total = solved.findNextSibling()
         return int(solved.text), int(total.text)
 
+    @staticmethod
+    def _has_class(class_name: str) -> str:
+        # XPath for a class token, like BeautifulSoup's class matching
+        return (f"contains(concat(' ', normalize-space(@class), ' '), "
+                f"' {class_name} ')")
+
+    def _parse_fast(self) -> gamestate.GameState:
+        tree = lxml.html.fromstring(self.html)
+        has_class = HTMLParser._has_class
+
+        buttons = tree.xpath(
+            f"(//div[{has_class(HTMLParser.BOARD_CLASS)}])[1]"
+            f"//button[{has_class(HTMLParser.BUTTON_CLASS)}]")
+        if not buttons:
+            raise ValueError("No board found.")
+        letters = [(int(button.get("id").strip("button-")),
+                    button.text_content())
+                   for button in buttons]
+        board = self._board_from_letters(letters)
+
+        theme = tree.xpath(
+            f"(//h1[{has_class(HTMLParser.THEME_CLASS)}])[1]")[0]
+        counts = tree.xpath(
+            f"(//*[@id='{HTMLParser.HINT_ID}'])[1]/p[1]/b[1]")[0]
+        total = counts.getnext()
+        return self._game_state(board, theme.text_content(),
+                                int(counts.text_content()),
+                                int(total.text_content()))
+
 
 def _test() -> None:
     from strandssolver.test.stubs.stubhtmlreader import StubHTMLReader
-    html_parser = HTMLParser(html_reader=StubHTMLReader())
-    print(html_parser.parse())
+    from timeit import timeit
+    html = StubHTMLReader().read()
+    fast_parser = HTMLParser(html=html)
+    soup_parser = HTMLParser(html=html, fast=False)
+    print(fast_parser.parse())
+    print(str(fast_parser.parse()) == str(soup_parser.parse()))
+    loop = 10
+    for html_parser in (fast_parser, soup_parser):
+        # Setting html drops the tree, so every parse starts from text
+        print(timeit(lambda: setattr(html_parser, "html", html)
+                     or html_parser.parse(), number=loop) / loop)
 
 
 if __name__ == "__main__":
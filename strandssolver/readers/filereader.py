@@ -0,0 +1,36 @@
+import os
+
+from typing import override
+
+from strandssolver.readers import reader
+
+
+class FileReader(reader.Reader):
+    """
+    Reads saved, already rendered pages from disk.
+    """
+    DEFAULT_ENCODING = "utf-8"
+
+    def __init__(self, path: str | bytes | os.PathLike = None,
+                 encoding: str = DEFAULT_ENCODING) -> None:
+        self.path = path
+        self.encoding = encoding
+
+    @override
+    def read(self, path: str | bytes | os.PathLike = None) -> str:
+        if path is None:
+            path = self.path
+        if path is None:
+            raise ValueError("No path to read from.")
+        with open(path, "r", encoding=self.encoding) as f:
+            return f.read()
+
+
+def _test() -> None:
+    from strandssolver.test.data import filepaths
+    file_reader = FileReader(filepaths.strands_html_path)
+    print(len(file_reader.read()))
+
+
+if __name__ == "__main__":
+    _test()
@@ -1,83 +1,158 @@
+from __future__ import annotations
+
 import asyncio
+import time
 
-from typing import override, List
+from typing import override, List, Iterable
 import datetime
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.wait import WebDriverWait
 
-from strandssolver.readers import reader
+from strandssolver.readers import reader, webdriverpool
 
 
 class HTMLReader(reader.Reader):
     DEFAULT_URL = "https://www.nytimes.com/games/strands"
-    DEFAULT_MAX_ATTEMPTS = 5
-    DEFAULT_TIME_BETWEEN_ATTEMPTS = 5.0
+    DEFAULT_TIMEOUT = 25.0
+    DEFAULT_POLL_FREQUENCY = 0.1
     DEFAULT_WEBDRIVER_ARGUMENTS = ["--headless=new"]
-    DEFAULT_LOAD_COMPLETE_WHEN_HTML_CONTAINS_THIS = "TODAY’S THEME"
+    # The parts HTMLParser reads: the board, the theme and the word counts
+    DEFAULT_READY_SELECTORS = ["div.UOpmtW_board button.pRjvKq_item",
+                               "h1.umfyna_clue",
+                               "#hint p b"]
 
     def __init__(self,
                  url: str | bytes = DEFAULT_URL,
-                 max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 timeout: float | datetime.timedelta = DEFAULT_TIMEOUT,
                  webdriver_arguments: List[str] = None,
-                 seconds_between_attempts: float | datetime.timedelta =
-                 DEFAULT_TIME_BETWEEN_ATTEMPTS,
-                 load_complete_when_html_contains_this: str =
-                 DEFAULT_LOAD_COMPLETE_WHEN_HTML_CONTAINS_THIS
+                 ready_selectors: List[str] = None,
+                 poll_frequency: float = DEFAULT_POLL_FREQUENCY,
+                 webdriver_pool: webdriverpool.WebDriverPool = None
                  ) -> None:
+        """
+        No browser is started here, the first read takes a driver from
+        webdriver_pool, by default the pool shared by all readers with the
+        same webdriver_arguments.
+        :param webdriver_pool: closed with the reader; the shared pool is
+        left to its atexit hook so other readers keep their drivers
+        :param timeout: deadline for a page to become ready
+        :param ready_selectors: CSS selectors that all have to match before
+        the page counts as loaded
+        :param poll_frequency: seconds between readiness checks
+        """
         self.url = url
-        self.max_attempts = max_attempts
-        self._seconds_between_attempts = None
-        self.seconds_between_attempts = seconds_between_attempts
-        self.load_complete_when_html_contains_this = \
-            load_complete_when_html_contains_this
+        self._timeout = None
+        self.timeout = timeout
+        if ready_selectors is None:
+            ready_selectors = HTMLReader.DEFAULT_READY_SELECTORS
+        self.ready_selectors = ready_selectors
+        self.poll_frequency = poll_frequency
         if webdriver_arguments is None:
             webdriver_arguments = HTMLReader.DEFAULT_WEBDRIVER_ARGUMENTS
         self.webdriver_arguments = webdriver_arguments
-        self.webdriver = self._setup_webdriver()
-
-    def _setup_webdriver(self) -> webdriver.Chrome:
-        chrome_options = Options()
-        for argument in self.webdriver_arguments:
-            chrome_options.add_argument(argument)
-        driver = webdriver.Chrome(options=chrome_options)
-        return driver
+        self._closes_pool = webdriver_pool is not None
+        if webdriver_pool is None:
+            webdriver_pool = webdriverpool.WebDriverPool.shared(
+                webdriver_arguments)
+        self.webdriver_pool = webdriver_pool
 
     @property
-    def seconds_between_attempts(self) -> float:
-        return self._seconds_between_attempts
+    def timeout(self) -> float:
+        return self._timeout
 
-    @seconds_between_attempts.setter
-    def seconds_between_attempts(self, seconds: float | datetime.timedelta
-                                 ) -> None:
+    @timeout.setter
+    def timeout(self, seconds: float | datetime.timedelta) -> None:
         if isinstance(seconds, datetime.timedelta):
             seconds = seconds.total_seconds()
-        self._seconds_between_attempts = seconds
+        self._timeout = seconds
+
+    def close(self) -> None:
+        # Quits the idle drivers of a pool given to this reader, the pool
+        # starts new ones when needed
+        if self._closes_pool:
+            self.webdriver_pool.close()
+
+    def __enter__(self) -> HTMLReader:
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        self.close()
 
     @override
     def read(self, url: str | bytes = None) -> str:
         if url is None:
             url = self.url
-        self.webdriver.get(url)
-        html = asyncio.run(self._get_html_source())
+        html = asyncio.run(self._read(url))
         return html
 
-    async def _get_html_source(self) -> str:
-        html = self.webdriver.page_source
-        # Previous line is the first attempt, so entering the loop is attempt 2
-        for _ in range(2, self.max_attempts + 1):
-            if self.load_complete_when_html_contains_this.lower(
-            ) in html.lower():
-                return html
-            await asyncio.sleep(self.seconds_between_attempts)
-            html = self.webdriver.page_source
-        raise TimeoutError(
-            f"Request timed out after {self.max_attempts} attempts."
-        )
+    async def read_many(self, urls: Iterable[str | bytes]) -> List[str]:
+        """
+        Fetches the urls concurrently, one pooled driver per page.
+        :return: the html of every url, in the same order
+        """
+        # Waiting for a driver blocks a worker thread, so never wait on
+        # more drivers than the pool has or navigation could starve
+        slots = asyncio.Semaphore(self.webdriver_pool.max_drivers)
+
+        async def read_in_slot(url: str | bytes) -> str:
+            async with slots:
+                return await self._read(url)
+
+        return list(await asyncio.gather(*(read_in_slot(url)
+                                           for url in urls)))
+
+    async def _read(self, url: str | bytes) -> str:
+        # Starting, navigating and quitting drivers blocks, so it runs on
+        # worker threads while other pages keep loading
+        driver = await asyncio.to_thread(self.webdriver_pool.acquire)
+        try:
+            started = time.monotonic()
+            await asyncio.to_thread(driver.get, url)
+            # The deadline covers navigation as well
+            seconds_left = max(0.0, self.timeout - (time.monotonic()
+                                                    - started))
+            html = await self._get_html_source(driver, seconds_left)
+        except BaseException:
+            await asyncio.to_thread(self.webdriver_pool.release, driver,
+                                    True)
+            raise
+        await asyncio.to_thread(self.webdriver_pool.release, driver)
+        return html
+
+    async def _get_html_source(self, driver: webdriver.Chrome,
+                               timeout: float) -> str:
+        # The wait blocks between polls, keep it off the event loop
+        await asyncio.to_thread(self._wait_until_ready, driver, timeout)
+        # Reading the page source is a WebDriver round trip as well
+        return await asyncio.to_thread(getattr, driver, "page_source")
+
+    def _wait_until_ready(self, driver: webdriver.Chrome, timeout: float
+                          ) -> None:
+        """
+        Returns as soon as every ready selector matches.
+        :param timeout: seconds to wait at most
+        """
+        condition = expected_conditions.all_of(
+            *(expected_conditions.presence_of_element_located(
+                (By.CSS_SELECTOR, selector))
+              for selector in self.ready_selectors))
+        try:
+            WebDriverWait(
+                driver, timeout, poll_frequency=self.poll_frequency
+            ).until(condition)
+        except TimeoutException as exception:
+            raise TimeoutError(
+                f"Page was not ready after {self.timeout} seconds."
+            ) from exception
 
 
 def _test() -> None:
-    html_reader = HTMLReader()
-    print(html_reader.read())
+    with HTMLReader() as html_reader:
+        print(html_reader.read())
+        print(len(asyncio.run(html_reader.read_many([html_reader.url] * 2))))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import requests
+
+from dataclasses import dataclass
+from typing import override, Dict, Optional
+
+from strandssolver.readers import reader
+
+
+@dataclass
+class CachedResponse:
+    text: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class HTTPReader(reader.Reader):
+    """
+    Fetches already rendered pages over plain HTTP, without a browser.
+    Connections are kept alive in a requests.Session. Pages that came
+    with an ETag or Last-Modified header are revalidated with a
+    conditional request, and a 304 answer returns the stored copy.
+    """
+    DEFAULT_TIMEOUT = 10.0
+    # Used when the server names no charset, requests would assume Latin-1
+    DEFAULT_ENCODING = "utf-8"
+
+    def __init__(self, url: str = None, timeout: float = DEFAULT_TIMEOUT,
+                 session: requests.Session = None,
+                 headers: Dict[str, str] = None,
+                 default_encoding: str = DEFAULT_ENCODING) -> None:
+        self.url = url
+        self.timeout = timeout
+        self.default_encoding = default_encoding
+        if session is None:
+            session = requests.Session()
+        self.session = session
+        if headers is not None:
+            self.session.headers.update(headers)
+        self._cached_responses: Dict[str, CachedResponse] = {}
+        self.number_of_not_modified = 0
+
+    @override
+    def read(self, url: str = None) -> str:
+        if url is None:
+            url = self.url
+        if url is None:
+            raise ValueError("No url to read from.")
+
+        headers = {}
+        cached = self._cached_responses.get(url)
+        if cached is not None:
+            if cached.etag is not None:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified is not None:
+                headers["If-Modified-Since"] = cached.last_modified
+        response = self.session.get(url, headers=headers,
+                                    timeout=self.timeout)
+        if response.status_code == requests.codes.not_modified \
+                and cached is not None:
+            self.number_of_not_modified += 1
+            return cached.text
+        response.raise_for_status()
+        if "charset" not in response.headers.get("Content-Type", ""):
+            response.encoding = self.default_encoding
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag is not None or last_modified is not None:
+            self._cached_responses[url] = CachedResponse(
+                text=response.text, etag=etag, last_modified=last_modified)
+        else:
+            self._cached_responses.pop(url, None)
+        return response.text
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> HTTPReader:
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        self.close()
+
+
+def _test() -> None:
+    import functools
+    import http.server
+    import threading
+    import urllib.parse
+    from strandssolver.test import data
+    from strandssolver.test.data import filenames
+    from importlib import resources
+
+    # Local stand-in for a snapshot host, it answers If-Modified-Since
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler,
+                                directory=str(resources.files(data)))
+    with http.server.ThreadingHTTPServer(("127.0.0.1", 0),
+                                         handler) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = (f"http://127.0.0.1:{server.server_address[1]}/"
+               f"{urllib.parse.quote(filenames.strands_html)}")
+        with HTTPReader(url) as http_reader:
+            first = http_reader.read()
+            second = http_reader.read()
+            print(len(first), first == second,
+                  http_reader.number_of_not_modified)
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    _test()
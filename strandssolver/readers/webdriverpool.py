@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import atexit
+import contextlib
+import threading
+
+from typing import Callable, Dict, Iterator, List, Tuple
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+
+def create_chrome(webdriver_arguments: List[str]) -> webdriver.Chrome:
+    chrome_options = Options()
+    for argument in webdriver_arguments:
+        chrome_options.add_argument(argument)
+    return webdriver.Chrome(options=chrome_options)
+
+
+class WebDriverPool:
+    """
+    Hands out browser drivers, starting them only when no idle one is
+    left and at most max_drivers at a time.
+    Drivers go back to the pool after use instead of being quit, so later
+    reads skip the browser startup. close() quits the idle drivers; drivers
+    in use at that point are quit once they are released.
+    """
+    DEFAULT_MAX_DRIVERS = 2
+
+    # Pools shared by all readers with the same driver arguments
+    _shared_pools: Dict[Tuple[str, ...], WebDriverPool] = {}
+    _shared_pools_lock = threading.Lock()
+
+    def __init__(self, driver_factory: Callable[[], webdriver.Chrome],
+                 max_drivers: int = None) -> None:
+        self.driver_factory = driver_factory
+        if max_drivers is None:
+            max_drivers = WebDriverPool.DEFAULT_MAX_DRIVERS
+        self.max_drivers = max_drivers
+        self._idle_drivers: List[webdriver.Chrome] = []
+        self._number_of_drivers = 0
+        self._generation = 0
+        self._generation_per_driver: Dict[int, int] = {}
+        self._condition = threading.Condition()
+
+    @classmethod
+    def shared(cls, webdriver_arguments: List[str]) -> WebDriverPool:
+        key = tuple(webdriver_arguments)
+        with cls._shared_pools_lock:
+            pool = cls._shared_pools.get(key)
+            if pool is None:
+                pool = cls(lambda: create_chrome(list(key)))
+                cls._shared_pools[key] = pool
+                # Leaked browsers outlive the interpreter otherwise
+                atexit.register(pool.close)
+            return pool
+
+    @property
+    def number_of_drivers(self) -> int:
+        return self._number_of_drivers
+
+    def acquire(self, timeout: float = None) -> webdriver.Chrome:
+        """
+        :param timeout: seconds to wait for a driver when all are in use,
+        forever if None
+        """
+        with self._condition:
+            while not self._idle_drivers \
+                    and self._number_of_drivers >= self.max_drivers:
+                if not self._condition.wait(timeout):
+                    raise TimeoutError(
+                        f"No web driver free after {timeout} seconds.")
+            if self._idle_drivers:
+                return self._idle_drivers.pop()
+            # Reserve the slot before the slow startup outside the lock
+            self._number_of_drivers += 1
+            generation = self._generation
+        try:
+            driver = self.driver_factory()
+        except BaseException:
+            with self._condition:
+                self._number_of_drivers -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._generation_per_driver[id(driver)] = generation
+        return driver
+
+    def release(self, driver: webdriver.Chrome, discard: bool = False
+                ) -> None:
+        """
+        :param discard: quit the driver instead of reusing it, e.g. after
+        it failed
+        """
+        with self._condition:
+            generation = self._generation_per_driver.get(id(driver))
+            # Drivers handed out before the last close() are not reused
+            keep = not discard and generation == self._generation
+            if keep:
+                self._idle_drivers.append(driver)
+            else:
+                self._generation_per_driver.pop(id(driver), None)
+                self._number_of_drivers -= 1
+            self._condition.notify()
+        if not keep:
+            driver.quit()
+
+    @contextlib.contextmanager
+    def driver(self, timeout: float = None) -> Iterator[webdriver.Chrome]:
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        except BaseException:
+            self.release(driver, discard=True)
+            raise
+        self.release(driver)
+
+    def close(self) -> None:
+        with self._condition:
+            idle_drivers = self._idle_drivers
+            self._idle_drivers = []
+            self._number_of_drivers -= len(idle_drivers)
+            for driver in idle_drivers:
+                self._generation_per_driver.pop(id(driver), None)
+            self._generation += 1
+            self._condition.notify_all()
+        for driver in idle_drivers:
+            driver.quit()
+
+    def __enter__(self) -> WebDriverPool:
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        self.close()
@@ -0,0 +1,230 @@
+import argparse
+import http.server
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+import numpy as np
+import pygtrie
+
+from typing import Dict, Any, List, Tuple
+
+from strandssolver.models import gamestate, graph, compacttrie, dictionarytrie
+from strandssolver.parsers import htmlparser
+from strandssolver.solver import solver, solverstats
+
+
+class ServiceBusyError(Exception):
+    pass
+
+
+class SolverService:
+    """
+    Keeps the trie loaded and the solver warmed up so every request only
+    pays for its own search and covering.
+    Requests are JSON objects with either
+        {"html": <saved Strands page>}
+    or
+        {"letters": "ROSSED...", "number_of_total_words": 7,
+         "shape": [8, 6], "number_of_solved_words": 0,
+         "solved": [[row, column], ...], "theme": ""}
+    where everything after number_of_total_words is optional.
+    At most max_concurrent_solves requests are solved at once, the others
+    wait up to queue_timeout seconds before they are turned away.
+    """
+    DEFAULT_MAX_CONCURRENT_SOLVES = 2
+    DEFAULT_QUEUE_TIMEOUT = 30.0
+
+    def __init__(self, trie: pygtrie.Trie | compacttrie.CompactTrie,
+                 max_concurrent_solves: int = None,
+                 queue_timeout: float = None,
+                 search_mode: solver.SearchMode = solver.SearchMode.BITBOARD
+                 ) -> None:
+        self.trie = trie
+        if max_concurrent_solves is None:
+            max_concurrent_solves = \
+                SolverService.DEFAULT_MAX_CONCURRENT_SOLVES
+        self.max_concurrent_solves = max_concurrent_solves
+        if queue_timeout is None:
+            queue_timeout = SolverService.DEFAULT_QUEUE_TIMEOUT
+        self.queue_timeout = queue_timeout
+        self.search_mode = search_mode
+        self._slots = threading.BoundedSemaphore(max_concurrent_solves)
+
+    def warm_up(self) -> bool:
+        """
+        Runs the whole pipeline once so lazily loaded code, e.g. the MILP
+        solver binary, is ready before the first request.
+        :return: False if the warm-up board could not be solved, e.g. with
+        a trie that has no words for it; the service still starts
+        """
+        try:
+            self.handle_request({"letters": "abcd", "shape": [2, 2],
+                                 "number_of_total_words": 1})
+        except Exception as exception:
+            sys.stderr.write(f"Warm-up failed: {exception!r}\n")
+            return False
+        return True
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        received = time.perf_counter()
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise ServiceBusyError(
+                f"No solver free after {self.queue_timeout} seconds.")
+        try:
+            started = time.perf_counter()
+            game = self.game_from_request(request)
+            parsed = time.perf_counter()
+            response = self._solve(game)
+        finally:
+            self._slots.release()
+        finished = time.perf_counter()
+
+        timings = response["timings"]
+        timings["queue_seconds"] = started - received
+        timings["parse_seconds"] = parsed - started
+        timings["total_seconds"] = finished - received
+        return response
+
+    @staticmethod
+    def game_from_request(request: Dict[str, Any]) -> gamestate.GameState:
+        if "html" in request:
+            return htmlparser.HTMLParser(html=request["html"]).parse()
+        if "letters" not in request:
+            raise ValueError("A request needs either html or letters.")
+        shape = tuple(request.get("shape", gamestate.Board.DEFAULT_SHAPE))
+        characters = gamestate.Board.characters_matrix_from_letters(
+            list(request["letters"]), shape)
+        solved_states = np.zeros(shape, dtype=np.bool_)
+        for node in request.get("solved", []):
+            solved_states[tuple(node)] = True
+        return gamestate.GameState(
+            board=gamestate.Board(characters, solved_states),
+            theme=request.get("theme", ""),
+            number_of_total_words=int(request["number_of_total_words"]),
+            number_of_solved_words=int(
+                request.get("number_of_solved_words", 0)))
+
+    def _solve(self, game: gamestate.GameState) -> Dict[str, Any]:
+        stats = solverstats.SolverStats()
+        with stats.timer("graph_build"):
+            game_graph = graph.CharacterGraphBuilder.build_graph_from_board(
+                game.board)
+        game_solver = solver.Solver(graph=game_graph, game=game,
+                                    trie=self.trie,
+                                    search_mode=self.search_mode)
+        solution, stats = game_solver.solve_with_stats(stats)
+        return {
+            "words": ["".join(game_graph.nodes[node]["character"]
+                              for node in word) for word in solution],
+            "paths": [[list(node) for node in word] for word in solution],
+            "number_of_candidates": len(game_solver.candidates),
+            "timings": {
+                "search_seconds": stats.search_seconds,
+                "covering_seconds": stats.matrix_build_seconds
+                + stats.covering_seconds,
+            },
+            "stats": stats.to_dict(),
+        }
+
+
+class SolverRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    POST /solve with a JSON request, GET /health to check the service is up.
+    """
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self._send_json(404, {"error": "Not found."})
+            return
+        self._send_json(200, {"status": "ok"})
+
+    def do_POST(self) -> None:
+        if self.path != "/solve":
+            self._send_json(404, {"error": "Not found."})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length))
+            response = self.server.service.handle_request(request)
+        except ServiceBusyError as exception:
+            self._send_json(503, {"error": str(exception)})
+            return
+        except (ValueError, KeyError, AttributeError, TypeError) \
+                as exception:
+            # Malformed JSON, letters not matching the shape, fields of the
+            # wrong type or html without a board
+            self._send_json(400, {"error": repr(exception)})
+            return
+        except Exception as exception:
+            # E.g. a covering that found no solution, the client still gets
+            # an answer instead of a dropped connection
+            self.log_error("Solving failed: %r", exception)
+            self._send_json(500, {"error": repr(exception)})
+            return
+        self._send_json(200, response)
+
+    def address_string(self) -> str:
+        # Unix socket clients have no (host, port) address
+        if isinstance(self.client_address, tuple):
+            return super().address_string()
+        return "unix"
+
+    def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class SolverHTTPServer(http.server.ThreadingHTTPServer):
+    def __init__(self, address: Tuple[str, int], service: SolverService
+                 ) -> None:
+        super().__init__(address, SolverRequestHandler)
+        self.service = service
+
+
+class SolverUnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str | os.PathLike, service: SolverService
+                 ) -> None:
+        if os.path.exists(path):
+            os.remove(path)
+        super().__init__(os.fspath(path), SolverRequestHandler)
+        self.service = service
+
+
+def main(arguments: List[str] = None) -> None:
+    from strandssolver.test.data import filepaths
+    argument_parser = argparse.ArgumentParser(
+        description="Serve Strands solutions over HTTP or a Unix socket.")
+    argument_parser.add_argument("--host", default="127.0.0.1")
+    argument_parser.add_argument("--port", type=int, default=8080)
+    argument_parser.add_argument("--unix-socket",
+                                 help="listen on this socket path instead")
+    argument_parser.add_argument("--trie",
+                                 default=filepaths.words_trie_binary_path)
+    argument_parser.add_argument(
+        "--max-concurrent-solves", type=int,
+        default=SolverService.DEFAULT_MAX_CONCURRENT_SOLVES)
+    parsed = argument_parser.parse_args(arguments)
+
+    trie = dictionarytrie.DictionaryTrieBuilder.load_trie_from_binary(
+        parsed.trie)
+    service = SolverService(
+        trie, max_concurrent_solves=parsed.max_concurrent_solves)
+    service.warm_up()
+    if parsed.unix_socket is not None:
+        server = SolverUnixServer(parsed.unix_socket, service)
+    else:
+        server = SolverHTTPServer((parsed.host, parsed.port), service)
+    with server:
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
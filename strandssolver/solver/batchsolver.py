@@ -0,0 +1,157 @@
+import argparse
+import concurrent.futures
+import json
+import os
+import pathlib
+import time
+import pygtrie
+
+from typing import List, Dict, Any, Iterator, Optional, TextIO
+
+from strandssolver.models import graph, compacttrie, dictionarytrie
+from strandssolver.parsers import htmlparser
+from strandssolver.readers import filereader
+from strandssolver.solver import solver, solverstats
+
+# Trie each pool worker solves with, set once per process
+_worker_trie: Optional[pygtrie.Trie | compacttrie.CompactTrie] = None
+_worker_search_mode: Optional[solver.SearchMode] = None
+
+
+def _initialize_worker(trie: pygtrie.Trie | compacttrie.CompactTrie,
+                       search_mode: solver.SearchMode) -> None:
+    global _worker_trie, _worker_search_mode
+    _worker_trie = trie
+    _worker_search_mode = search_mode
+
+
+def _solve_file_in_worker(path: str) -> Dict[str, Any]:
+    return solve_file(path, _worker_trie, _worker_search_mode)
+
+
+def solve_file(path: str | os.PathLike,
+               trie: pygtrie.Trie | compacttrie.CompactTrie,
+               search_mode: solver.SearchMode = solver.SearchMode.BITBOARD
+               ) -> Dict[str, Any]:
+    """
+    Parses and solves one saved puzzle page.
+    :return: JSON serializable record with the words, their paths and
+    timings, or the error if the page could not be solved
+    """
+    record: Dict[str, Any] = {"file": os.fspath(path)}
+    start = time.perf_counter()
+    try:
+        game = htmlparser.HTMLParser(
+            html_reader=filereader.FileReader(path)).parse()
+        parsed = time.perf_counter()
+        stats = solverstats.SolverStats()
+        with stats.timer("graph_build"):
+            game_graph = graph.CharacterGraphBuilder.build_graph_from_board(
+                game.board)
+        game_solver = solver.Solver(graph=game_graph, game=game, trie=trie,
+                                    search_mode=search_mode)
+        solution, stats = game_solver.solve_with_stats(stats)
+    except Exception as exception:
+        # One broken page should not end a replay of the whole archive
+        record["error"] = repr(exception)
+        return record
+    solved = time.perf_counter()
+
+    record["theme"] = game.theme
+    record["number_of_total_words"] = game.number_of_total_words
+    record["words"] = ["".join(game_graph.nodes[node]["character"]
+                               for node in word) for word in solution]
+    record["paths"] = [[list(node) for node in word] for word in solution]
+    record["parse_seconds"] = parsed - start
+    record["solve_seconds"] = solved - parsed
+    record["stats"] = stats.to_dict()
+    return record
+
+
+class BatchSolver:
+    """
+    Solves a directory of saved Strands pages on a process pool.
+    The trie is loaded once and handed to every worker when the pool
+    starts; a memory-mapped binary trie is reopened from its file in each
+    worker, so all processes share the same pages.
+    """
+    DEFAULT_PATTERN = "*.html"
+
+    def __init__(self, trie: pygtrie.Trie | compacttrie.CompactTrie,
+                 workers: int = None,
+                 search_mode: solver.SearchMode = solver.SearchMode.BITBOARD
+                 ) -> None:
+        self.trie = trie
+        self.workers = workers
+        self.search_mode = search_mode
+
+    def solve_directory(self, directory: str | os.PathLike,
+                        pattern: str = DEFAULT_PATTERN
+                        ) -> Iterator[Dict[str, Any]]:
+        """
+        :return: iterator over the records in the order the files finish
+        """
+        paths = sorted(str(path)
+                       for path in pathlib.Path(directory).glob(pattern))
+        return self.solve_files(paths)
+
+    def solve_files(self, paths: List[str]) -> Iterator[Dict[str, Any]]:
+        if self.workers is not None and self.workers <= 1:
+            for path in paths:
+                yield solve_file(path, self.trie, self.search_mode)
+            return
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_initialize_worker,
+                initargs=(self.trie, self.search_mode)) as executor:
+            futures = [executor.submit(_solve_file_in_worker, path)
+                       for path in paths]
+            for future in concurrent.futures.as_completed(futures):
+                yield future.result()
+
+    @staticmethod
+    def write_jsonl(records: Iterator[Dict[str, Any]], f: TextIO) -> int:
+        """
+        Writes every record as soon as it arrives.
+        :return: number of records written
+        """
+        number_of_records = 0
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            number_of_records += 1
+        return number_of_records
+
+
+def load_trie(path: str | os.PathLike
+              ) -> pygtrie.Trie | compacttrie.CompactTrie:
+    if os.fspath(path).endswith(".json"):
+        return dictionarytrie.DictionaryTrieBuilder.load_trie_from_json(path)
+    return dictionarytrie.DictionaryTrieBuilder.load_trie_from_binary(path)
+
+
+def main(arguments: List[str] = None) -> None:
+    from strandssolver.test.data import filepaths
+    argument_parser = argparse.ArgumentParser(
+        description="Solve a directory of saved Strands pages and write "
+                    "one JSON line per page.")
+    argument_parser.add_argument("directory")
+    # A file rather than stdout, the MILP solver logs to stdout
+    argument_parser.add_argument("output", help="JSONL file to write")
+    argument_parser.add_argument("--trie",
+                                 default=filepaths.words_trie_binary_path,
+                                 help="binary or JSON word trie")
+    argument_parser.add_argument("--workers", type=int, default=None)
+    argument_parser.add_argument("--pattern",
+                                 default=BatchSolver.DEFAULT_PATTERN)
+    parsed = argument_parser.parse_args(arguments)
+
+    batch_solver = BatchSolver(load_trie(parsed.trie),
+                               workers=parsed.workers)
+    records = batch_solver.solve_directory(parsed.directory, parsed.pattern)
+    with open(parsed.output, "w", encoding="utf-8") as f:
+        BatchSolver.write_jsonl(records, f)
+
+
+if __name__ == "__main__":
+    main()
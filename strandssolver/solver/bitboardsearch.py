@@ -0,0 +1,132 @@
+import pygtrie
+
+from typing import Dict, List, Tuple
+
+from strandssolver.models import compiledboard, compacttrie
+from strandssolver.solver import solverstats
+from strandssolver.dfs.typing import Node
+
+
+class BitboardWordSearch:
+    """
+    Finds the same words as running StrandsDFSVisitor through
+    depthfirstsearch.dfs_edges, but walks a CompiledBoard instead of a
+    networkx graph. The visited cells of the current path are kept in a
+    single int, so extending a path is a handful of bit operations.
+    With a CompactTrie the prefix is tracked as a trie state and advanced
+    one character at a time instead of being looked up from the root.
+    """
+    DEFAULT_DEPTH_LIMIT = 8
+
+    def __init__(self, board: compiledboard.CompiledBoard,
+                 trie: pygtrie.Trie | compacttrie.CompactTrie,
+                 depth_limit: int = DEFAULT_DEPTH_LIMIT) -> None:
+        self.board = board
+        self.trie = trie
+        self.depth_limit = depth_limit
+        self.words: Dict[Tuple[Node, ...], str] = {}
+        self.counters = solverstats.SearchCounters()
+
+    def search_from_node(self, node: Node) -> None:
+        self.search_from_cell(self.board.cell_id(node))
+
+    def search_from_cell(self, cell: int) -> None:
+        if not self.board.is_active(cell):
+            return
+        prefix = self.board.letters[cell]
+        counters = self.counters
+        counters.trie_lookups += 1
+        if isinstance(self.trie, compacttrie.CompactTrie):
+            state = self.trie.step(self.trie.root, prefix)
+            if state < 0:
+                counters.prunes += 1
+                return
+            self._extend_path_with_states([cell], state, 1 << cell)
+            return
+        if not self.trie.has_node(prefix):
+            counters.prunes += 1
+            return
+        self._extend_path([cell], prefix, 1 << cell)
+
+    def _extend_path(self, path: List[int], prefix: str, visited: int
+                     ) -> None:
+        counters = self.counters
+        counters.vertices_discovered += 1
+        counters.trie_lookups += 1
+        node = self.trie.has_node(prefix)
+        if node & pygtrie.Trie.HAS_VALUE:
+            self.words[self.board.nodes_from_cells(tuple(path))] = prefix
+        # Leaves are still words, they just end the path
+        if len(path) >= self.depth_limit \
+                or not node & pygtrie.Trie.HAS_SUBTRIE:
+            return
+
+        letters = self.board.letters
+        candidates = self.board.neighbour_masks[path[-1]] & ~visited
+        while candidates:
+            lowest_bit = candidates & -candidates
+            candidates ^= lowest_bit
+            cell = lowest_bit.bit_length() - 1
+            next_prefix = prefix + letters[cell]
+            counters.trie_lookups += 1
+            if not self.trie.has_node(next_prefix):
+                counters.prunes += 1
+                continue
+            path.append(cell)
+            self._extend_path(path, next_prefix, visited | lowest_bit)
+            path.pop()
+
+    def _extend_path_with_states(self, path: List[int], state: int,
+                                 visited: int) -> None:
+        trie = self.trie
+        letters = self.board.letters
+        counters = self.counters
+        counters.vertices_discovered += 1
+        counters.trie_lookups += 1
+        if trie.is_word(state):
+            self.words[self.board.nodes_from_cells(tuple(path))] = "".join(
+                letters[cell] for cell in path)
+        if len(path) >= self.depth_limit or not trie.has_children(state):
+            return
+
+        candidates = self.board.neighbour_masks[path[-1]] & ~visited
+        while candidates:
+            lowest_bit = candidates & -candidates
+            candidates ^= lowest_bit
+            cell = lowest_bit.bit_length() - 1
+            next_state = trie.step(state, letters[cell])
+            counters.trie_lookups += 1
+            if next_state < 0:
+                counters.prunes += 1
+                continue
+            path.append(cell)
+            self._extend_path_with_states(path, next_state,
+                                          visited | lowest_bit)
+            path.pop()
+
+
+def _test() -> None:
+    from strandssolver.test.stubs import stubgamestate
+    from strandssolver.test.stubs import stubdictionarytrie
+    game = stubgamestate.StubGameState()
+    board = compiledboard.CompiledBoardBuilder.build_compiled_board_from_board(
+        game.board)
+    trie = stubdictionarytrie.StubDictionaryTrieBuilder.load_trie_from_json()
+
+    search = BitboardWordSearch(board, trie)
+    for node in board.nodes:
+        search.search_from_node(node)
+    print(len(search.words))
+    print(sorted(set(search.words.values()), key=len, reverse=True)[:20])
+
+    compact = stubdictionarytrie.StubDictionaryTrieBuilder.\
+        compact_trie_from_trie(trie)
+    compact_search = BitboardWordSearch(board, compact)
+    for node in board.nodes:
+        compact_search.search_from_node(node)
+    print(compact_search.words == search.words)
+    print(search.counters, compact_search.counters)
+
+
+if __name__ == "__main__":
+    _test()
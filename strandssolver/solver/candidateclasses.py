@@ -0,0 +1,54 @@
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+from strandssolver.dfs.typing import Node
+
+
+class CandidateClasses:
+    """
+    Candidate paths grouped by the set of cells they cover.
+    Paths over the same cells, e.g. the same word traced two ways or an
+    anagram of it, are interchangeable in a covering, so only one
+    representative per class needs a column in the problem matrix. The
+    representative is the first path found; the others are kept so they
+    can be recovered for output.
+    """
+
+    def __init__(self, words: Iterable[Tuple[Node, ...]]) -> None:
+        # Insertion ordered, so the classes follow the search order
+        self.paths_per_cells: Dict[FrozenSet[Node],
+                                   List[Tuple[Node, ...]]] = {}
+        for word in words:
+            self.paths_per_cells.setdefault(frozenset(word), []).append(word)
+
+    def __len__(self) -> int:
+        return len(self.paths_per_cells)
+
+    @property
+    def number_of_paths(self) -> int:
+        return sum(len(paths) for paths in self.paths_per_cells.values())
+
+    @property
+    def representatives(self) -> List[Tuple[Node, ...]]:
+        return [paths[0] for paths in self.paths_per_cells.values()]
+
+    def paths(self, word: Iterable[Node]) -> List[Tuple[Node, ...]]:
+        """
+        :param word: any path of the class, e.g. its representative
+        :return: every path over the same cells, the representative first
+        """
+        return list(self.paths_per_cells.get(frozenset(word), []))
+
+
+def _test() -> None:
+    words = [((0, 0), (0, 1), (1, 1)),
+             ((0, 1), (0, 0), (1, 1)),
+             ((1, 1), (0, 1), (0, 0)),
+             ((1, 0), (1, 1))]
+    classes = CandidateClasses(words)
+    print(len(classes), classes.number_of_paths)
+    print(classes.representatives)
+    print(classes.paths(((0, 0), (1, 1), (0, 1))))
+
+
+if __name__ == "__main__":
+    _test()
@@ -0,0 +1,228 @@
+from typing import List, Tuple, Sequence, Dict, Iterator, Optional
+
+from strandssolver.models import compiledboard
+from strandssolver.dfs.typing import Node
+
+
+class CandidateReducer:
+    """
+    Drops candidate words that cannot be part of any exact cover of the
+    active cells before the covering problem is built.
+    Column dominance is applied once: with every word counting the same,
+    a word is only dominated by another over exactly the same cells (a
+    word covering a superset of cells would overlap what the smaller one
+    leaves free), so only the first word per cell set is kept.
+    Two rules are then applied until neither removes anything:
+    - Region feasibility: taking a word must leave every connected region
+      of the remaining cells coverable, i.e. at least as large as the
+      shortest candidate, (for small regions) covered by the candidates
+      lying inside it, and with enough words left to fill all regions.
+    - Row dominance: if every candidate covering cell a also covers cell b,
+      a candidate covering b but not a can never be taken. A cell with a
+      single candidate is the special case that forces that candidate.
+    Every exact cover with at most max_number_of_words words survives, up
+    to swapping words over the same cells.
+    The rules assume an exact cover exists, so the result is only meant
+    for exact models; the closest covering may need the dropped words.
+    If the rules show that no exact cover exists (some cell loses all its
+    candidates), the words are returned unchanged so the residual
+    optimizer can still find the closest covering.
+    """
+    # Regions up to this many cells are checked for coverage by the
+    # candidates inside them, larger ones are left to the covering solver
+    REGION_CHECK_LIMIT = 16
+
+    def __init__(self, board: compiledboard.CompiledBoard,
+                 max_number_of_words: int = None) -> None:
+        self.board = board
+        self.max_number_of_words = max_number_of_words
+        self.number_of_rounds = 0
+        self.removed_by_region = 0
+        self.removed_by_dominance = 0
+        self.removed_by_column_dominance = 0
+
+    def reduce(self, words: Sequence[Tuple[Node, ...]]
+               ) -> List[Tuple[Node, ...]]:
+        self.number_of_rounds = 0
+        self.removed_by_region = 0
+        self.removed_by_dominance = 0
+        self.removed_by_column_dominance = 0
+        masks = [self.board.mask_from_nodes(word) for word in words]
+        alive = self._first_word_per_mask(masks)
+        self.removed_by_column_dominance = alive.count(False)
+        word_ids_per_cell: Dict[int, List[int]] = {
+            cell: [] for cell in self.board.cells_in_mask(
+                self.board.active_mask)}
+        for word_id, mask in enumerate(masks):
+            for cell in self.board.cells_in_mask(mask):
+                word_ids_per_cell[cell].append(word_id)
+
+        changed = True
+        while changed:
+            self.number_of_rounds += 1
+            common_masks = self._common_masks(masks, alive,
+                                              word_ids_per_cell)
+            if common_masks is None:
+                # No exact cover exists
+                return list(words)
+            removed = self._remove_dominated(masks, alive, common_masks)
+            self.removed_by_dominance += removed
+            changed = removed > 0
+            removed = self._remove_infeasible_regions(masks, alive,
+                                                      word_ids_per_cell)
+            self.removed_by_region += removed
+            changed = changed or removed > 0
+
+        if self._common_masks(masks, alive, word_ids_per_cell) is None:
+            return list(words)
+        return [word for word, keep in zip(words, alive) if keep]
+
+    @staticmethod
+    def _first_word_per_mask(masks: List[int]) -> List[bool]:
+        seen = set()
+        alive = []
+        for mask in masks:
+            alive.append(mask not in seen)
+            seen.add(mask)
+        return alive
+
+    def _common_masks(self, masks: List[int], alive: List[bool],
+                      word_ids_per_cell: Dict[int, List[int]]
+                      ) -> Optional[Dict[int, int]]:
+        """
+        :return: for every active cell, the cells covered by all of its
+        remaining candidates, or None if a cell has no candidate left
+        """
+        common_masks = {}
+        for cell, word_ids in word_ids_per_cell.items():
+            common = -1
+            for word_id in word_ids:
+                if alive[word_id]:
+                    common &= masks[word_id]
+            if common == -1:
+                return None
+            common_masks[cell] = common
+        return common_masks
+
+    def _remove_dominated(self, masks: List[int], alive: List[bool],
+                          common_masks: Dict[int, int]) -> int:
+        active_mask = self.board.active_mask
+        removed = 0
+        for word_id, mask in enumerate(masks):
+            if not alive[word_id]:
+                continue
+            for cell in self.board.cells_in_mask(active_mask & ~mask):
+                # Covering cell means covering common_masks[cell] as well,
+                # which this word would overlap
+                if common_masks[cell] & mask:
+                    alive[word_id] = False
+                    removed += 1
+                    break
+        return removed
+
+    def _remove_infeasible_regions(self, masks: List[int],
+                                   alive: List[bool],
+                                   word_ids_per_cell: Dict[int, List[int]]
+                                   ) -> int:
+        lengths = [mask.bit_count()
+                   for mask, keep in zip(masks, alive) if keep]
+        if not lengths:
+            return 0
+        min_length = min(lengths)
+        max_length = max(lengths)
+        active_mask = self.board.active_mask
+        # Many words leave the same regions behind, e.g. a corner cell
+        feasible_per_region: Dict[int, bool] = {}
+
+        removed = 0
+        for word_id, mask in enumerate(masks):
+            if not alive[word_id]:
+                continue
+            number_of_words_needed = 1
+            for region in self._regions(active_mask & ~mask):
+                size = region.bit_count()
+                # Ceiling division, even the longest words need this many
+                number_of_words_needed += -(-size // max_length)
+                if region not in feasible_per_region:
+                    feasible_per_region[region] = self._is_coverable(
+                        region, size, min_length, masks, alive,
+                        word_ids_per_cell)
+                if not feasible_per_region[region]:
+                    break
+            else:
+                if (self.max_number_of_words is None
+                        or number_of_words_needed
+                        <= self.max_number_of_words):
+                    continue
+            alive[word_id] = False
+            removed += 1
+            # Regions judged with the word still alive may have changed
+            feasible_per_region.clear()
+        return removed
+
+    def _is_coverable(self, region: int, size: int, min_length: int,
+                      masks: List[int], alive: List[bool],
+                      word_ids_per_cell: Dict[int, List[int]]) -> bool:
+        if size < min_length:
+            return False
+        if size > CandidateReducer.REGION_CHECK_LIMIT:
+            return True
+        covered = 0
+        for cell in self.board.cells_in_mask(region):
+            if covered >> cell & 1:
+                continue
+            for word_id in word_ids_per_cell[cell]:
+                mask = masks[word_id]
+                if alive[word_id] and not mask & ~region:
+                    covered |= mask
+                    break
+            else:
+                return False
+        return True
+
+    def _regions(self, mask: int) -> Iterator[int]:
+        """
+        :return: the connected components of the cells in mask
+        """
+        neighbour_masks = self.board.neighbour_masks
+        while mask:
+            region = mask & -mask
+            frontier = region
+            while frontier:
+                grown = 0
+                for cell in self.board.cells_in_mask(frontier):
+                    grown |= neighbour_masks[cell]
+                frontier = grown & mask & ~region
+                region |= frontier
+            mask &= ~region
+            yield region
+
+
+def _test() -> None:
+    from strandssolver.test.stubs import stubgraph
+    from strandssolver.test.stubs import stubgamestate
+    from strandssolver.test.stubs import stubdictionarytrie
+    from strandssolver.solver import solver
+    graph = stubgraph.StubGraphBuilder.build_graph_from_board()
+    game = stubgamestate.StubGameState()
+    trie = stubdictionarytrie.StubDictionaryTrieBuilder.load_trie_from_json()
+
+    strands_solver = solver.Solver(graph=graph, game=game, trie=trie,
+                                   search_mode=solver.SearchMode.BITBOARD)
+    words = strands_solver.find_all_words()
+    board = compiledboard.CompiledBoardBuilder.build_compiled_board_from_board(
+        game.board)
+    reducer = CandidateReducer(board, max_number_of_words=(
+            game.number_of_total_words - game.number_of_solved_words + 1))
+    reduced_words = reducer.reduce(words)
+    print(len(words), "->", len(reduced_words), "words in",
+          reducer.number_of_rounds, "rounds,",
+          reducer.removed_by_region, "by region,",
+          reducer.removed_by_dominance, "by row dominance,",
+          reducer.removed_by_column_dominance, "by column dominance")
+    print(sorted(map(frozenset, strands_solver.find_best_covering(
+        reduced_words))) == sorted(map(frozenset, strands_solver.solve())))
+
+
+if __name__ == "__main__":
+    _test()
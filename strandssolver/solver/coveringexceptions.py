@@ -0,0 +1,18 @@
+class CoveringException(Exception):
+    pass
+
+
+class NoExactCoverError(CoveringException):
+    pass
+
+
+class BackendUnavailableError(CoveringException):
+    pass
+
+
+class NoSolutionFoundError(CoveringException):
+    pass
+
+
+class CoveringBudgetExceededError(NoExactCoverError):
+    pass
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import numpy as np
+import numpy.typing
+
+from typing import Dict, Set, List, Iterator, Optional
+
+from strandssolver.solver import coveringexceptions, incidencematrix
+
+
+class ExactCoverSolver:
+    """
+    Solves Ax = b exactly for a binary problem matrix with Knuth's
+    Algorithm X. The dancing links are dictionaries of sets: covering a
+    column removes it together with all rows that clash with the chosen one,
+    uncovering puts them back in reverse order.
+    A: the (n x m) binary problem matrix, one column per candidate
+    x: the (m x 1) binary input vector, the chosen candidates
+    b: the (n x 1) binary target vector, rows with a 0 must stay uncovered
+    """
+    def __init__(self, problem: np.typing.ArrayLike
+                 | incidencematrix.IncidenceMatrix = None,
+                 target: np.typing.ArrayLike = None,
+                 max_input_vector_sum: int = None,
+                 min_input_vector_sum: int = None) -> None:
+        if not isinstance(problem, incidencematrix.IncidenceMatrix):
+            problem = incidencematrix.IncidenceMatrix.from_dense(problem)
+        self.problem = problem
+        if target is None:
+            target = np.ones(self.problem.shape[0], dtype=np.bool_)
+        self.target = np.array(target, dtype=np.bool_)
+        self.max_input_vector_sum = max_input_vector_sum
+        self.min_input_vector_sum = min_input_vector_sum
+        # Search nodes visited by the last call, for benchmarking
+        self.number_of_search_nodes = 0
+
+    def optimize_binary_vector(self) -> np.typing.NDArray[np.bool_]:
+        """
+        Finds the first exact cover in a deterministic search order.
+        :return: binary input vector selecting the covering candidates
+        :raises NoExactCoverError: if no exact cover within the maximum
+        number of candidates exists
+        """
+        solution = next(self.iterate_exact_covers(), None)
+        if solution is None:
+            raise coveringexceptions.NoExactCoverError(
+                "The candidates admit no exact cover of the target with "
+                f"between {self.min_input_vector_sum} and "
+                f"{self.max_input_vector_sum} candidates.")
+        x = np.zeros(self.problem.shape[1], dtype=np.bool_)
+        x[solution] = True
+        return x
+
+    def iterate_exact_covers(self) -> Iterator[List[int]]:
+        columns_per_row, rows_per_column = self._build_links()
+        self.number_of_search_nodes = 0
+        max_column_size = max((len(rows) for rows in rows_per_column.values()),
+                              default=0)
+        yield from self._search(columns_per_row, rows_per_column, [],
+                                max_column_size)
+
+    def _build_links(self) -> tuple[Dict[int, Set[int]],
+                                    Dict[int, List[int]]]:
+        # Rows of the matrix are the items to cover, columns the options
+        A = self.problem
+        b = self.target
+        forbidden_entries = ~b[A.indices]
+        allowed_columns = np.bincount(A.column_ids()[forbidden_entries],
+                                      minlength=A.shape[1]) == 0
+        indptr = A.indptr.tolist()
+        indices = A.indices.tolist()
+
+        columns_per_row = {int(i): set() for i in np.flatnonzero(b)}
+        rows_per_column = {}
+        for j in np.flatnonzero(allowed_columns).tolist():
+            rows = indices[indptr[j]:indptr[j + 1]]
+            if not rows:
+                continue
+            rows_per_column[j] = rows
+            for i in rows:
+                columns_per_row[i].add(j)
+        return columns_per_row, rows_per_column
+
+    def _search(self, columns_per_row: Dict[int, Set[int]],
+                rows_per_column: Dict[int, List[int]],
+                solution: List[int],
+                max_column_size: int) -> Iterator[List[int]]:
+        self.number_of_search_nodes += 1
+        if not columns_per_row:
+            if (self.min_input_vector_sum is None
+                    or len(solution) >= self.min_input_vector_sum):
+                yield list(solution)
+            return
+        if self.max_input_vector_sum is not None:
+            remaining = self.max_input_vector_sum - len(solution)
+            if len(columns_per_row) > remaining * max_column_size:
+                return
+
+        # Branch on the most constrained row
+        row = min(columns_per_row, key=lambda i: len(columns_per_row[i]))
+        for column in sorted(columns_per_row[row]):
+            solution.append(column)
+            removed = self._select(columns_per_row, rows_per_column, column)
+            yield from self._search(columns_per_row, rows_per_column,
+                                    solution, max_column_size)
+            self._deselect(columns_per_row, rows_per_column, column, removed)
+            solution.pop()
+
+    @staticmethod
+    def _select(columns_per_row: Dict[int, Set[int]],
+                rows_per_column: Dict[int, List[int]],
+                column: int) -> List[Set[int]]:
+        removed = []
+        for row in rows_per_column[column]:
+            for clashing_column in columns_per_row[row]:
+                for other_row in rows_per_column[clashing_column]:
+                    if other_row != row:
+                        columns_per_row[other_row].remove(clashing_column)
+            removed.append(columns_per_row.pop(row))
+        return removed
+
+    @staticmethod
+    def _deselect(columns_per_row: Dict[int, Set[int]],
+                  rows_per_column: Dict[int, List[int]],
+                  column: int, removed: List[Set[int]]) -> None:
+        for row in reversed(rows_per_column[column]):
+            columns_per_row[row] = removed.pop()
+            for clashing_column in columns_per_row[row]:
+                for other_row in rows_per_column[clashing_column]:
+                    if other_row != row:
+                        columns_per_row[other_row].add(clashing_column)
+
+
+def _test() -> None:
+    # Knuth's example from "Dancing Links": items A-G as rows, options
+    # CEF, ADG, BCF, AD, BG, DEG as columns, the only cover is CEF+AD+BG
+    A = np.array([[0, 1, 0, 1, 0, 0],
+                  [0, 0, 1, 0, 1, 0],
+                  [1, 0, 1, 0, 0, 0],
+                  [0, 1, 0, 1, 0, 1],
+                  [1, 0, 0, 0, 0, 1],
+                  [1, 0, 1, 0, 0, 0],
+                  [0, 1, 0, 0, 1, 1]], dtype=np.bool_)
+    solver = ExactCoverSolver(problem=A)
+    print("Exact cover:", solver.optimize_binary_vector(),
+          "search nodes:", solver.number_of_search_nodes)
+    try:
+        ExactCoverSolver(problem=A, max_input_vector_sum=2
+                         ).optimize_binary_vector()
+    except coveringexceptions.NoExactCoverError as error:
+        print(error)
+
+
+if __name__ == "__main__":
+    _test()
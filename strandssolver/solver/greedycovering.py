@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import numpy as np
+import numpy.typing
+
+from typing import Dict, Set, List, Iterator
+
+from strandssolver.solver import (coveringexceptions, exactcover,
+                                  incidencematrix)
+
+
+class GreedyCoveringSolver(exactcover.ExactCoverSolver):
+    """
+    Cheap covering heuristic run before the MILP. It searches like
+    ExactCoverSolver, branching on the most constrained row, but tries the
+    longest candidates first and gives up after a budget of search nodes.
+    Most boards have an obvious tiling it finds within a few hundred nodes.
+    When the budget runs out, the non-overlapping partial covering that
+    left the fewest rows uncovered is kept as the incumbent, a warm start
+    for the MILP. Rows no candidate covers at all, e.g. the cells of a word
+    missing from the dictionary, are left out of the search, so the
+    incumbent still tiles the rest of the board.
+    """
+    DEFAULT_NODE_BUDGET = 2000
+
+    def __init__(self, problem: np.typing.ArrayLike
+                 | incidencematrix.IncidenceMatrix = None,
+                 target: np.typing.ArrayLike = None,
+                 max_input_vector_sum: int = None,
+                 min_input_vector_sum: int = None,
+                 node_budget: int = None) -> None:
+        super().__init__(problem, target, max_input_vector_sum,
+                         min_input_vector_sum)
+        if node_budget is None:
+            node_budget = GreedyCoveringSolver.DEFAULT_NODE_BUDGET
+        self.node_budget = node_budget
+        # Set once the last call ran out of search nodes
+        self.budget_exhausted = False
+        # Columns of the best partial covering seen by the last call
+        self.incumbent: List[int] = []
+        # Rows of the target no candidate covers, found by the last call
+        self.uncoverable_rows: List[int] = []
+        self._fewest_uncovered_rows: int = None
+
+    def optimize_binary_vector(self) -> np.typing.NDArray[np.bool_]:
+        """
+        :return: binary input vector of an exact cover
+        :raises CoveringBudgetExceededError: if the budget ran out before
+        an exact cover was found, see incumbent_vector
+        :raises NoExactCoverError: if the search finished without one
+        """
+        try:
+            return super().optimize_binary_vector()
+        except coveringexceptions.NoExactCoverError:
+            if self.budget_exhausted and not self.uncoverable_rows:
+                raise coveringexceptions.CoveringBudgetExceededError(
+                    f"No exact cover found within {self.node_budget} "
+                    "search nodes.") from None
+            raise
+
+    def incumbent_vector(self) -> np.typing.NDArray[np.bool_]:
+        """
+        :return: binary input vector of the best partial covering, every
+        row covered at most once
+        """
+        x = np.zeros(self.problem.shape[1], dtype=np.bool_)
+        x[self.incumbent] = True
+        return x
+
+    def iterate_exact_covers(self) -> Iterator[List[int]]:
+        self.budget_exhausted = False
+        self.incumbent = []
+        self._fewest_uncovered_rows = None
+        yield from super().iterate_exact_covers()
+
+    def _build_links(self) -> tuple[Dict[int, Set[int]],
+                                    Dict[int, List[int]]]:
+        columns_per_row, rows_per_column = super()._build_links()
+        self.uncoverable_rows = [row for row, columns
+                                 in columns_per_row.items() if not columns]
+        for row in self.uncoverable_rows:
+            del columns_per_row[row]
+        return columns_per_row, rows_per_column
+
+    def _search(self, columns_per_row: Dict[int, Set[int]],
+                rows_per_column: Dict[int, List[int]],
+                solution: List[int],
+                max_column_size: int) -> Iterator[List[int]]:
+        if self.number_of_search_nodes >= self.node_budget:
+            self.budget_exhausted = True
+            return
+        if (self._fewest_uncovered_rows is None
+                or len(columns_per_row) < self._fewest_uncovered_rows):
+            self._fewest_uncovered_rows = len(columns_per_row)
+            self.incumbent = list(solution)
+        self.number_of_search_nodes += 1
+        if not columns_per_row:
+            if not self.uncoverable_rows and (
+                    self.min_input_vector_sum is None
+                    or len(solution) >= self.min_input_vector_sum):
+                yield list(solution)
+            return
+        if self.max_input_vector_sum is not None:
+            remaining = self.max_input_vector_sum - len(solution)
+            if len(columns_per_row) > remaining * max_column_size:
+                return
+
+        row = min(columns_per_row, key=lambda i: len(columns_per_row[i]))
+        # Longest candidates first, they leave the fewest cells to fill
+        columns = sorted(columns_per_row[row],
+                         key=lambda j: (-len(rows_per_column[j]), j))
+        for column in columns:
+            solution.append(column)
+            removed = self._select(columns_per_row, rows_per_column, column)
+            yield from self._search(columns_per_row, rows_per_column,
+                                    solution, max_column_size)
+            self._deselect(columns_per_row, rows_per_column, column, removed)
+            solution.pop()
+            if self.budget_exhausted:
+                return
+
+
+def _test() -> None:
+    # Rows 0-5 are cells, the long candidates 0 and 2 tile them
+    A = np.array([[1, 1, 0, 0, 0],
+                  [1, 0, 0, 1, 0],
+                  [1, 0, 0, 0, 1],
+                  [0, 1, 1, 0, 0],
+                  [0, 0, 1, 1, 0],
+                  [0, 0, 1, 0, 1]], dtype=np.bool_)
+    greedy_solver = GreedyCoveringSolver(problem=A)
+    print(greedy_solver.optimize_binary_vector(),
+          greedy_solver.number_of_search_nodes)
+    try:
+        GreedyCoveringSolver(problem=A, node_budget=1).optimize_binary_vector()
+    except coveringexceptions.CoveringBudgetExceededError as exception:
+        print(type(exception).__name__, exception)
+
+    # No candidate covers row 3, the incumbent tiles the other rows
+    A = np.array([[1, 0, 1, 0],
+                  [1, 0, 0, 1],
+                  [0, 1, 0, 1],
+                  [0, 0, 0, 0]], dtype=np.bool_)
+    for node_budget in (None, 2):
+        greedy_solver = GreedyCoveringSolver(problem=A,
+                                             node_budget=node_budget)
+        try:
+            greedy_solver.optimize_binary_vector()
+        except coveringexceptions.CoveringException as exception:
+            print(type(exception).__name__, exception)
+        print("Incumbent:", greedy_solver.incumbent_vector())
+
+
+if __name__ == "__main__":
+    _test()
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import numpy as np
+import numpy.typing
+
+from dataclasses import dataclass
+from typing import Tuple, Iterable, Dict, Hashable, Sequence
+
+
+@dataclass
+class IncidenceMatrix:
+    """
+    Binary (n x m) matrix in compressed sparse column (CSC) form:
+    the rows set in column j are indices[indptr[j]:indptr[j + 1]].
+    For the covering problem the rows are cells and the columns words.
+    """
+    shape: Tuple[int, int]
+    indptr: np.typing.NDArray[np.intp]
+    indices: np.typing.NDArray[np.intp]
+
+    @property
+    def nnz(self) -> int:
+        return int(self.indptr[-1])
+
+    def column(self, j: int) -> np.typing.NDArray[np.intp]:
+        return self.indices[self.indptr[j]:self.indptr[j + 1]]
+
+    def column_ids(self) -> np.typing.NDArray[np.intp]:
+        """
+        :return: the column of every stored entry, aligned with indices
+        """
+        return np.repeat(np.arange(self.shape[1], dtype=np.intp),
+                         np.diff(self.indptr))
+
+    def to_row_major(self) -> Tuple[np.typing.NDArray[np.intp],
+                                    np.typing.NDArray[np.intp]]:
+        """
+        Converts to compressed sparse row (CSR) form.
+        :return: (row pointers, column indices); the columns set in row i
+        are columns[row_pointers[i]:row_pointers[i + 1]]
+        """
+        order = np.argsort(self.indices, kind='stable')
+        columns = self.column_ids()[order]
+        row_pointers = np.zeros(self.shape[0] + 1, dtype=np.intp)
+        np.cumsum(np.bincount(self.indices, minlength=self.shape[0]),
+                  out=row_pointers[1:])
+        return row_pointers, columns
+
+    def dot(self, x: np.typing.ArrayLike) -> np.typing.NDArray[np.int_]:
+        """
+        :param x: (m x 1) input vector
+        :return: Ax, e.g. how often each cell is covered
+        """
+        weights = np.asarray(x, dtype=np.int_)[self.column_ids()]
+        return np.bincount(self.indices, weights=weights,
+                           minlength=self.shape[0]).astype(np.int_)
+
+    def append_row(self, columns: np.typing.ArrayLike) -> IncidenceMatrix:
+        """
+        :param columns: (m x 1) binary vector, the new row
+        :return: ((n + 1) x m) matrix with the row appended
+        """
+        columns = np.asarray(columns, dtype=np.bool_)
+        n, m = self.shape
+        indptr = np.zeros(m + 1, dtype=np.intp)
+        np.cumsum(np.diff(self.indptr) + columns, out=indptr[1:])
+        indices = np.empty(int(indptr[-1]), dtype=np.intp)
+        # Existing entries keep their offset within their column, the new
+        # row goes last so row indices stay sorted
+        column_ids = self.column_ids()
+        offsets = np.arange(self.nnz, dtype=np.intp) - self.indptr[column_ids]
+        indices[indptr[column_ids] + offsets] = self.indices
+        indices[indptr[1:][columns] - 1] = n
+        return IncidenceMatrix(shape=(n + 1, m), indptr=indptr,
+                               indices=indices)
+
+    def remove(self, rows: np.typing.ArrayLike, columns: np.typing.ArrayLike
+               ) -> None:
+        """
+        Deletes rows and columns in place, the rest keep their order.
+        :param rows: indices of the rows to delete
+        :param columns: indices of the columns to delete
+        """
+        n, m = self.shape
+        keep_rows = np.ones(n, dtype=np.bool_)
+        keep_rows[np.asarray(rows, dtype=np.intp)] = False
+        keep_columns = np.ones(m, dtype=np.bool_)
+        keep_columns[np.asarray(columns, dtype=np.intp)] = False
+
+        column_ids = self.column_ids()
+        keep_entries = keep_rows[self.indices] & keep_columns[column_ids]
+        lengths = np.bincount(column_ids[keep_entries], minlength=m)
+        indptr = np.zeros(int(keep_columns.sum()) + 1, dtype=np.intp)
+        np.cumsum(lengths[keep_columns], out=indptr[1:])
+        new_row_per_row = np.cumsum(keep_rows, dtype=np.intp) - 1
+
+        self.indices = new_row_per_row[self.indices[keep_entries]]
+        self.indptr = indptr
+        self.shape = (int(keep_rows.sum()), int(keep_columns.sum()))
+
+    def to_dense(self) -> np.typing.NDArray[np.bool_]:
+        dense = np.zeros(self.shape, dtype=np.bool_)
+        dense[self.indices, self.column_ids()] = True
+        return dense
+
+    @classmethod
+    def from_dense(cls, dense: np.typing.ArrayLike) -> IncidenceMatrix:
+        dense = np.asarray(dense, dtype=np.bool_)
+        # Column-major nonzero scan yields entries grouped by column
+        columns, rows = np.nonzero(dense.T)
+        indptr = np.zeros(dense.shape[1] + 1, dtype=np.intp)
+        np.cumsum(np.bincount(columns, minlength=dense.shape[1]),
+                  out=indptr[1:])
+        return cls(shape=dense.shape, indptr=indptr,
+                   indices=rows.astype(np.intp))
+
+    @classmethod
+    def from_columns(cls, columns: Sequence[Sequence[Hashable]],
+                     index_per_row: Dict[Hashable, int]) -> IncidenceMatrix:
+        """
+        Builds the matrix in one pass over the columns' row labels.
+        :param columns: row labels of each column, e.g. the nodes of a word
+        :param index_per_row: row index of every label
+        :return: incidence matrix with one column per entry of columns
+        """
+        lengths = np.fromiter((len(column) for column in columns),
+                              dtype=np.intp, count=len(columns))
+        indptr = np.zeros(len(columns) + 1, dtype=np.intp)
+        np.cumsum(lengths, out=indptr[1:])
+        indices = np.fromiter((index_per_row[label]
+                               for column in columns for label in column),
+                              dtype=np.intp, count=int(indptr[-1]))
+        return cls(shape=(len(index_per_row), len(columns)),
+                   indptr=indptr, indices=indices)
+
+
+def _test() -> None:
+    dense = np.array([[1, 0, 1],
+                      [0, 0, 1],
+                      [1, 1, 0]], dtype=np.bool_)
+    matrix = IncidenceMatrix.from_dense(dense)
+    print(matrix)
+    print((matrix.to_dense() == dense).all())
+    print(matrix.to_row_major())
+    print(matrix.dot([1, 1, 0]))
+    print(matrix.append_row([0, 1, 1]).to_dense())
+    matrix.remove([1], [0])
+    print((matrix.to_dense() == dense[[0, 2]][:, [1, 2]]).all())
+    words = [("a", "c"), ("c",), ("a", "b")]
+    print(IncidenceMatrix.from_columns(words, {"a": 0, "b": 1, "c": 2}))
+
+
+if __name__ == "__main__":
+    _test()
@@ -0,0 +1,392 @@
+from __future__ import annotations
+
+import abc
+import dataclasses
+import enum
+import functools
+import importlib.util
+import time
+import numpy as np
+import numpy.typing
+
+from dataclasses import dataclass
+from typing import (Callable, Iterable, List, Optional, Sequence, Tuple,
+                    TYPE_CHECKING)
+
+from strandssolver.solver import incidencematrix, coveringexceptions
+
+if TYPE_CHECKING:
+    # pulp and the solvers are imported when a model is built
+    import pulp
+
+
+def lp_sum(expressions: Iterable[pulp.LpAffineExpression | pulp.LpVariable]
+           ) -> pulp.LpAffineExpression:
+    # pulp.lpSum, without importing pulp until the norm is evaluated
+    import pulp
+    return pulp.lpSum(expressions)
+
+
+class Backend(enum.Enum):
+    CBC = "cbc"
+    HIGHS = "highs"
+    CP_SAT = "cp_sat"
+
+
+class MILPStatus(enum.Enum):
+    OPTIMAL = "optimal"
+    # A solution was found, but the solver stopped before proving it
+    # optimal, e.g. at the time limit or within the relative gap
+    FEASIBLE = "feasible"
+    INFEASIBLE = "infeasible"
+    # The solver stopped without any solution, e.g. at the time limit
+    NOT_SOLVED = "not_solved"
+
+
+@dataclass
+class MILPOptions:
+    """
+    Limits for a single solve, None leaves the backend's default.
+    """
+    time_limit: Optional[float] = None
+    threads: Optional[int] = None
+    relative_gap: Optional[float] = None
+    # Initial x, backends use it as a starting solution or hint
+    warm_start: Optional[Sequence[bool]] = None
+    verbose: bool = True
+
+
+@dataclass(frozen=True)
+class BinaryProgram:
+    """
+    What BinaryOptimizer hands to a backend: find a binary x with
+    Ax = b if exact, otherwise minimizing norm(|Ax - b|), with the number of
+    ones in x bounded by min_input_vector_sum and max_input_vector_sum.
+    """
+    problem: incidencematrix.IncidenceMatrix
+    target: np.typing.NDArray[np.bool_]
+    exact: bool
+    norm: Callable = lp_sum
+    min_input_vector_sum: Optional[int] = None
+    max_input_vector_sum: Optional[int] = None
+
+
+@dataclass
+class MILPResult:
+    status: MILPStatus
+    # None when the backend found no solution
+    x: Optional[np.typing.NDArray[np.bool_]]
+    build_seconds: float
+    solve_seconds: float
+    backend: Backend
+
+    @property
+    def has_solution(self) -> bool:
+        return self.status in (MILPStatus.OPTIMAL, MILPStatus.FEASIBLE)
+
+
+class MILPBackend(abc.ABC):
+    BACKEND: Backend = None
+
+    @abc.abstractmethod
+    def is_available(self) -> bool:
+        pass
+
+    @abc.abstractmethod
+    def solve(self, program: BinaryProgram, options: MILPOptions = None
+              ) -> MILPResult:
+        pass
+
+    def _check_available(self) -> None:
+        if not self.is_available():
+            raise coveringexceptions.BackendUnavailableError(
+                f"The {self.BACKEND.value} backend is not installed.")
+
+
+class PuLPBackend(MILPBackend, abc.ABC):
+    """
+    Builds the model with PuLP and leaves solving to one of its solvers.
+    """
+
+    @abc.abstractmethod
+    def _create_solver(self, options: MILPOptions) -> pulp.LpSolver:
+        pass
+
+    def solve(self, program: BinaryProgram, options: MILPOptions = None
+              ) -> MILPResult:
+        import pulp
+        self._check_available()
+        if options is None:
+            options = MILPOptions()
+        build_start = time.perf_counter()
+        optimization, x, residuals_abs = PuLPBackend.build_model(program)
+        if options.warm_start is not None:
+            PuLPBackend._set_initial_values(program, options.warm_start, x,
+                                            residuals_abs)
+        solver = self._create_solver(options)
+        solve_start = time.perf_counter()
+        optimization.solve(solver)
+        solved = time.perf_counter()
+
+        status = {
+            pulp.LpSolutionOptimal: MILPStatus.OPTIMAL,
+            pulp.LpSolutionIntegerFeasible: MILPStatus.FEASIBLE,
+            pulp.LpSolutionInfeasible: MILPStatus.INFEASIBLE,
+        }.get(optimization.sol_status, MILPStatus.NOT_SOLVED)
+        solution = None
+        if status in (MILPStatus.OPTIMAL, MILPStatus.FEASIBLE):
+            solution = np.array([round(variable.varValue or 0)
+                                 for variable in x], dtype=np.bool_)
+        return MILPResult(status=status, x=solution,
+                          build_seconds=solve_start - build_start,
+                          solve_seconds=solved - solve_start,
+                          backend=self.BACKEND)
+
+    @staticmethod
+    def build_model(program: BinaryProgram
+                    ) -> Tuple[pulp.LpProblem, List[pulp.LpVariable],
+                               List[pulp.LpVariable]]:
+        """
+        :return: the model, x and the residual magnitudes, which are empty
+        for exact programs
+        """
+        import pulp
+        A = program.problem
+        b = program.target
+        n, m = A.shape
+        row_pointers, columns = A.to_row_major()
+
+        optimization = pulp.LpProblem("Binary_Optimization", pulp.LpMinimize)
+        x = [pulp.LpVariable(f'x_{i}', cat=pulp.LpBinary) for i in range(m)]
+        # Define the residual vector r = Ax - b, A only contributes its
+        # non-zero entries
+        residuals = [
+            pulp.LpAffineExpression(
+                [(x[j], 1)
+                 for j in columns[row_pointers[i]:row_pointers[i + 1]]],
+                constant=-int(b[i]))
+            for i in range(n)
+        ]
+
+        residuals_abs = []
+        if program.exact:
+            # Pure feasibility problem, any x with Ax = b is optimal
+            for i in range(n):
+                optimization += residuals[i] == 0
+        else:
+            residuals_abs = [pulp.LpVariable(f'r_abs_{i}', lowBound=0)
+                             for i in range(n)]
+
+            for i in range(n):
+                optimization += residuals_abs[i] >= residuals[i]
+                optimization += residuals_abs[i] >= -residuals[i]
+
+            objective = program.norm(residuals_abs)
+            optimization += objective
+
+        if program.max_input_vector_sum is not None:
+            optimization += pulp.lpSum(x) <= program.max_input_vector_sum
+        if program.min_input_vector_sum is not None:
+            optimization += pulp.lpSum(x) >= program.min_input_vector_sum
+        return optimization, x, residuals_abs
+
+    @staticmethod
+    def _set_initial_values(program: BinaryProgram,
+                            warm_start: Sequence[bool],
+                            x: List[pulp.LpVariable],
+                            residuals_abs: List[pulp.LpVariable]) -> None:
+        warm_start = np.asarray(warm_start, dtype=np.bool_)
+        for variable, value in zip(x, warm_start):
+            variable.setInitialValue(int(value))
+        # A complete start is accepted more readily than x alone
+        residuals = np.abs(program.problem.dot(warm_start.astype(np.int64))
+                           - program.target.astype(np.int64))
+        for variable, value in zip(residuals_abs, residuals):
+            variable.setInitialValue(int(value))
+
+
+class CBCBackend(PuLPBackend):
+    BACKEND = Backend.CBC
+
+    def is_available(self) -> bool:
+        import pulp
+        return pulp.PULP_CBC_CMD(msg=False).available()
+
+    def _create_solver(self, options: MILPOptions) -> pulp.LpSolver:
+        import pulp
+        return pulp.PULP_CBC_CMD(msg=options.verbose,
+                                 timeLimit=options.time_limit,
+                                 threads=options.threads,
+                                 gapRel=options.relative_gap,
+                                 warmStart=options.warm_start is not None)
+
+
+@functools.cache
+def _warm_started_highs() -> type:
+    import highspy
+    import pulp
+
+    class WarmStartedHiGHS(pulp.HiGHS):
+        # pulp.HiGHS takes no initial solution, hand the variables' initial
+        # values to HiGHS right before it runs
+        def callSolver(self, lp: pulp.LpProblem) -> None:
+            solution = highspy.HighsSolution()
+            solution.col_value = [variable.varValue or 0.0
+                                  for variable in lp.variables()]
+            solution.value_valid = True
+            lp.solverModel.setSolution(solution)
+            super().callSolver(lp)
+
+    return WarmStartedHiGHS
+
+
+class HiGHSBackend(PuLPBackend):
+    """
+    HiGHS through its Python bindings, or its command line solver if only
+    that is installed.
+    """
+    BACKEND = Backend.HIGHS
+
+    def is_available(self) -> bool:
+        import pulp
+        return (importlib.util.find_spec("highspy") is not None
+                or pulp.HiGHS_CMD(msg=False).available())
+
+    def _create_solver(self, options: MILPOptions) -> pulp.LpSolver:
+        import pulp
+        if importlib.util.find_spec("highspy") is None:
+            return pulp.HiGHS_CMD(msg=options.verbose,
+                                  timeLimit=options.time_limit,
+                                  threads=options.threads,
+                                  gapRel=options.relative_gap,
+                                  warmStart=options.warm_start is not None)
+        solver_type = pulp.HiGHS
+        if options.warm_start is not None:
+            solver_type = _warm_started_highs()
+        return solver_type(msg=options.verbose,
+                           timeLimit=options.time_limit,
+                           threads=options.threads,
+                           gapRel=options.relative_gap)
+
+
+class CPSATBackend(MILPBackend):
+    """
+    OR-Tools' CP-SAT solver, which works well on pure binary models and
+    uses all cores by default. Only the default L1 norm is supported.
+    """
+    BACKEND = Backend.CP_SAT
+
+    def is_available(self) -> bool:
+        return importlib.util.find_spec("ortools") is not None
+
+    def solve(self, program: BinaryProgram, options: MILPOptions = None
+              ) -> MILPResult:
+        self._check_available()
+        from ortools.sat.python import cp_model
+        if program.norm is not lp_sum:
+            raise ValueError("CP-SAT only supports the default norm.")
+        if options is None:
+            options = MILPOptions()
+        build_start = time.perf_counter()
+        A = program.problem
+        b = program.target
+        n, m = A.shape
+        row_pointers, columns = A.to_row_major()
+
+        model = cp_model.CpModel()
+        x = [model.NewBoolVar(f"x_{j}") for j in range(m)]
+        residuals_abs = []
+        for i in range(n):
+            row = [x[j] for j in columns[row_pointers[i]:row_pointers[i + 1]]]
+            covered = cp_model.LinearExpr.Sum(row)
+            if program.exact:
+                model.Add(covered == int(b[i]))
+                continue
+            residual_abs = model.NewIntVar(0, max(len(row), 1), f"r_abs_{i}")
+            model.Add(residual_abs >= covered - int(b[i]))
+            model.Add(residual_abs >= int(b[i]) - covered)
+            residuals_abs.append(residual_abs)
+        if residuals_abs:
+            model.Minimize(cp_model.LinearExpr.Sum(residuals_abs))
+        if program.max_input_vector_sum is not None:
+            model.Add(cp_model.LinearExpr.Sum(x)
+                      <= program.max_input_vector_sum)
+        if program.min_input_vector_sum is not None:
+            model.Add(cp_model.LinearExpr.Sum(x)
+                      >= program.min_input_vector_sum)
+        if options.warm_start is not None:
+            for variable, value in zip(x, options.warm_start):
+                model.AddHint(variable, bool(value))
+
+        solver = cp_model.CpSolver()
+        if options.time_limit is not None:
+            solver.parameters.max_time_in_seconds = options.time_limit
+        if options.threads is not None:
+            solver.parameters.num_workers = options.threads
+        if options.relative_gap is not None:
+            solver.parameters.relative_gap_limit = options.relative_gap
+        solver.parameters.log_search_progress = options.verbose
+        solve_start = time.perf_counter()
+        cp_status = solver.Solve(model)
+        solved = time.perf_counter()
+
+        status = {
+            cp_model.OPTIMAL: MILPStatus.OPTIMAL,
+            cp_model.FEASIBLE: MILPStatus.FEASIBLE,
+            cp_model.INFEASIBLE: MILPStatus.INFEASIBLE,
+        }.get(cp_status, MILPStatus.NOT_SOLVED)
+        solution = None
+        if status in (MILPStatus.OPTIMAL, MILPStatus.FEASIBLE):
+            solution = np.array([solver.Value(variable) for variable in x],
+                                dtype=np.bool_)
+        return MILPResult(status=status, x=solution,
+                          build_seconds=solve_start - build_start,
+                          solve_seconds=solved - solve_start,
+                          backend=self.BACKEND)
+
+
+BACKEND_TYPES = {
+    Backend.CBC: CBCBackend,
+    Backend.HIGHS: HiGHSBackend,
+    Backend.CP_SAT: CPSATBackend,
+}
+
+
+def create_backend(backend: Backend) -> MILPBackend:
+    return BACKEND_TYPES[backend]()
+
+
+def available_backends() -> List[Backend]:
+    return [backend for backend, backend_type in BACKEND_TYPES.items()
+            if backend_type().is_available()]
+
+
+def _test() -> None:
+    A = incidencematrix.IncidenceMatrix.from_dense(
+        np.array([[1, 0, 1],
+                  [0, 0, 1],
+                  [1, 1, 0]], dtype=np.bool_))
+    b = np.ones(3, dtype=np.bool_)
+    print(available_backends())
+    for backend in available_backends():
+        for exact in (True, False):
+            program = BinaryProgram(A, b, exact, max_input_vector_sum=2)
+            options = MILPOptions(time_limit=5, threads=1, relative_gap=0,
+                                  warm_start=[False, True, True],
+                                  verbose=False)
+            result = create_backend(backend).solve(program, options)
+            print(backend, exact, result.status, result.x,
+                  f"{result.build_seconds:.4f}s",
+                  f"{result.solve_seconds:.4f}s")
+    # No solution covers every row exactly once
+    program = BinaryProgram(
+        incidencematrix.IncidenceMatrix.from_dense(
+            np.array([[1, 1], [1, 0], [0, 1]], dtype=np.bool_)),
+        np.ones(3, dtype=np.bool_), exact=True)
+    for backend in available_backends():
+        print(backend, create_backend(backend).solve(
+            program, MILPOptions(verbose=False)).status)
+
+
+if __name__ == "__main__":
+    _test()
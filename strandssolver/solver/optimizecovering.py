@@ -1,12 +1,28 @@
 from __future__ import annotations
 
+import dataclasses
 import numpy as np
 import numpy.typing
-import nptyping
-import pulp
 import networkx as nx
+import time
+import enum
 
-from typing import Callable, Iterable, Tuple
+from typing import Callable, Iterable, Tuple, TYPE_CHECKING
+
+from strandssolver.solver import (incidencematrix, milpbackends,
+                                  coveringexceptions, greedycovering)
+
+if TYPE_CHECKING:
+    # Only needed for annotations
+    import nptyping
+
+
+class Formulation(enum.Enum):
+    # Minimize the norm of r = Ax - b, always feasible
+    RESIDUAL = "residual"
+    # Require Ax = b (set partitioning), falls back to RESIDUAL when
+    # infeasible
+    SET_PARTITIONING = "set_partitioning"
 
 
 class BinaryOptimizer:
@@ -17,17 +33,40 @@ class BinaryOptimizer:
     A: the (n x m) binary problem matrix
     x: the (m x 1) binary input vector
     b: the (n x 1) binary target vector
+    A may be dense or an IncidenceMatrix; the model is built from its
+    non-zero entries only.
+    With Formulation.SET_PARTITIONING the optimizer first looks for an x
+    with r = 0 using equality rows only, and solves the residual model only
+    if no such x exists. min_input_vector_sum only bounds that exact model,
+    the residual fallback keeps just the upper bound so a best-effort x
+    exists even with fewer candidates than the lower bound. Without
+    residual_fallback, NoExactCoverError is raised instead, e.g. when the
+    caller solves the residual model over other candidates.
+    The model is solved by a backend, CBC unless another is given. A time
+    limit in options bounds both models together: the exact model gets
+    EXACT_TIME_SHARE of it and the residual model at least the rest, so a
+    slow exact model still leaves time for a best-effort x. If the residual
+    model finds none either, the warm start is returned; with a time limit
+    and no warm start in options, the greedy partial covering is used.
     """
     type ProblemType = nptyping.NDArray[nptyping.Shape["*, *"], nptyping.Bool]
     type InputType = nptyping.NDArray[nptyping.Shape["*"], nptyping.Bool]
     type TargetType = nptyping.NDArray[nptyping.Shape["*"], nptyping.Bool]
     type ResidualType = BinaryOptimizer.TargetType
 
-    DEFAULT_NORM = pulp.lpSum
+    DEFAULT_NORM = milpbackends.lp_sum
+    DEFAULT_FORMULATION = Formulation.RESIDUAL
+    DEFAULT_BACKEND = milpbackends.Backend.CBC
+    EXACT_TIME_SHARE = 0.5
 
     def __init__(self, problem: ProblemType = None, target: TargetType = None,
                  max_input_vector_sum: int = None,
-                 norm: Callable[[ResidualType], float] = None) -> None:
+                 norm: Callable[[ResidualType], float] = None,
+                 formulation: Formulation = None,
+                 min_input_vector_sum: int = None,
+                 backend: milpbackends.MILPBackend = None,
+                 options: milpbackends.MILPOptions = None,
+                 residual_fallback: bool = True) -> None:
         self._target: BinaryOptimizer.TargetType = None
         self.target = target
         self._problem: BinaryOptimizer.ProblemType = None
@@ -36,6 +75,26 @@ class BinaryOptimizer:
             norm = BinaryOptimizer.DEFAULT_NORM
         self.norm = norm
         self.max_input_vector_sum = max_input_vector_sum
+        self.min_input_vector_sum = min_input_vector_sum
+        if formulation is None:
+            formulation = BinaryOptimizer.DEFAULT_FORMULATION
+        self.formulation = formulation
+        if backend is None:
+            backend = milpbackends.create_backend(
+                BinaryOptimizer.DEFAULT_BACKEND)
+        self.backend = backend
+        if options is None:
+            options = milpbackends.MILPOptions()
+        self.options = options
+        self.residual_fallback = residual_fallback
+        # Formulation whose solution the last optimization returned
+        self.used_formulation: Formulation = None
+        # Backend result of the last model solved
+        self.result: milpbackends.MILPResult = None
+        # Wall time of the last optimization, split into model building and
+        # running the solver
+        self.build_seconds: float = None
+        self.solve_seconds: float = None
 
     @property
     def target(self) -> BinaryOptimizer.TargetType:
@@ -46,8 +105,7 @@ class BinaryOptimizer:
     @target.setter
     def target(self, target: np.typing.ArrayLike | BinaryOptimizer.TargetType
                ) -> None:
-        if not isinstance(target, nptyping.NDArray[nptyping.Shape["*"],
-        nptyping.Bool]):
+        if not _is_boolean_array(target, ndim=1):
             target = np.array(target, dtype=np.bool_)
         self._target = target
 
@@ -60,42 +118,102 @@ class BinaryOptimizer:
     @problem.setter
     def problem(self,
                 problem: np.typing.ArrayLike | BinaryOptimizer.ProblemType
+                | incidencematrix.IncidenceMatrix
                 ) -> None:
-        if not isinstance(problem, nptyping.NDArray[nptyping.Shape["*, *"],
-        nptyping.Bool]):
+        if isinstance(problem, incidencematrix.IncidenceMatrix):
+            self._problem = problem
+            return
+        if not _is_boolean_array(problem, ndim=2):
             problem = np.array(problem, dtype=np.bool_)
         if problem.ndim != 2:
             shape = (self.target.shape[0], -1)
             problem = problem.reshape(shape)
         self._problem = problem
 
-    def optimize_binary_vector(self) -> BinaryOptimizer.InputType:
-        A = self.problem
-        b = self.target
-        n, m = A.shape
+    def sparse_problem(self) -> incidencematrix.IncidenceMatrix:
+        if isinstance(self.problem, incidencematrix.IncidenceMatrix):
+            return self.problem
+        return incidencematrix.IncidenceMatrix.from_dense(self.problem)
 
-        optimization = pulp.LpProblem("Binary_Optimization", pulp.LpMinimize)
-        x = [pulp.LpVariable(f'x_{i}', cat=pulp.LpBinary) for i in range(m)]
-        # Define the residual vector r = Ax - b
-        residuals = [pulp.lpSum(A[i, j] * x[j] for j in range(m)) - b[i]
-                     for i in range(n)]
+    def optimize_binary_vector(self) -> BinaryOptimizer.InputType:
+        self.build_seconds = 0.0
+        self.solve_seconds = 0.0
+        start = time.perf_counter()
+        options = self.options
+        if options.time_limit is not None and options.warm_start is None:
+            # The limit may stop both models before they find any x
+            options = dataclasses.replace(options,
+                                          warm_start=self._greedy_start())
+        if self.formulation is Formulation.SET_PARTITIONING:
+            result = self._solve(Formulation.SET_PARTITIONING, start,
+                                 options)
+            if result.has_solution:
+                self.used_formulation = Formulation.SET_PARTITIONING
+                return result.x
+            if not self.residual_fallback:
+                raise coveringexceptions.NoExactCoverError(
+                    f"The {result.backend.value} backend found no exact "
+                    f"cover ({result.status.value}).")
+            # No exact cover, settle for the smallest residual instead
 
-        residuals_abs = [pulp.LpVariable(f'r_abs_{i}', lowBound=0)
-                         for i in range(n)]
+        result = self._solve(Formulation.RESIDUAL, start, options)
+        self.used_formulation = Formulation.RESIDUAL
+        if result.has_solution:
+            return result.x
+        if options.warm_start is not None:
+            # E.g. the greedy partial covering, better than no answer
+            return np.array(options.warm_start, dtype=np.bool_)
+        raise coveringexceptions.NoSolutionFoundError(
+            f"The {result.backend.value} backend stopped without a "
+            f"solution ({result.status.value}).")
 
-        for i in range(n):
-            optimization += residuals_abs[i] >= residuals[i]
-            optimization += residuals_abs[i] >= -residuals[i]
+    def _greedy_start(self) -> BinaryOptimizer.InputType:
+        greedy_solver = greedycovering.GreedyCoveringSolver(
+            self.sparse_problem(), self.target, self.max_input_vector_sum,
+            min_input_vector_sum=self.min_input_vector_sum)
+        try:
+            return greedy_solver.optimize_binary_vector()
+        except coveringexceptions.NoExactCoverError:
+            return greedy_solver.incumbent_vector()
 
-        objective = self.norm(residuals_abs)
-        optimization += objective
+    def _time_limit(self, formulation: Formulation, start: float
+                    ) -> float | None:
+        time_limit = self.options.time_limit
+        if time_limit is None:
+            return None
+        if formulation is Formulation.SET_PARTITIONING:
+            return time_limit * BinaryOptimizer.EXACT_TIME_SHARE
+        # The residual model gets whatever the exact one left, but never
+        # less than the share kept back for it
+        remaining = time_limit - (time.perf_counter() - start)
+        return max(remaining,
+                   time_limit * (1 - BinaryOptimizer.EXACT_TIME_SHARE))
 
-        if self.max_input_vector_sum is not None:
-            optimization += pulp.lpSum(x) <= self.max_input_vector_sum
+    def _solve(self, formulation: Formulation, start: float,
+               options: milpbackends.MILPOptions
+               ) -> milpbackends.MILPResult:
+        if options.time_limit is not None:
+            options = dataclasses.replace(
+                options, time_limit=self._time_limit(formulation, start))
+        exact = formulation is Formulation.SET_PARTITIONING
+        program = milpbackends.BinaryProgram(
+            problem=self.sparse_problem(),
+            target=self.target,
+            exact=exact,
+            norm=self.norm,
+            min_input_vector_sum=self.min_input_vector_sum if exact else None,
+            max_input_vector_sum=self.max_input_vector_sum)
+        self.result = self.backend.solve(program, options)
+        self.build_seconds += self.result.build_seconds
+        self.solve_seconds += self.result.solve_seconds
+        return self.result
 
-        optimization.solve()
 
-        return np.array(x, dtype=np.bool_)
+def _is_boolean_array(array: object, ndim: int) -> bool:
+    # Same check as isinstance against nptyping's NDArray[Shape, Bool]
+    # without importing nptyping
+    return (isinstance(array, np.ndarray) and array.dtype == np.bool_
+            and array.ndim == ndim)
 
 
 def convert_words_to_problem_matrix(words: Iterable[Tuple[Tuple[int, ...]]],
@@ -113,6 +231,16 @@ def convert_words_to_problem_matrix(words: Iterable[Tuple[Tuple[int, ...]]],
     return problem
 
 
+def convert_words_to_sparse_problem_matrix(
+        words: Iterable[Tuple[Tuple[int, ...]]],
+        graph: nx.Graph
+) -> incidencematrix.IncidenceMatrix:
+    index_per_node = {node: index for index, node in enumerate(graph.nodes)}
+    if not isinstance(words, list):
+        words = list(words)
+    return incidencematrix.IncidenceMatrix.from_columns(words, index_per_node)
+
+
 def convert_problem_solution_to_words(solution: BinaryOptimizer.InputType,
                                       words: Iterable[Tuple[Tuple[int, ...]]]
                                       ) -> Iterable[Tuple[Tuple[int, ...]]]:
@@ -130,6 +258,55 @@ def _test() -> None:
     optimizer = BinaryOptimizer(problem=A, target=b)
     x_optimal = optimizer.optimize_binary_vector()
     print("Optimal x:", x_optimal)
+    print(f"Build: {optimizer.build_seconds:.6f}s, "
+          f"solve: {optimizer.solve_seconds:.6f}s")
+
+    optimizer = BinaryOptimizer(problem=A, target=b,
+                                formulation=Formulation.SET_PARTITIONING)
+    print("Optimal x:", optimizer.optimize_binary_vector(),
+          "using", optimizer.used_formulation)
+    # Rows 1 and 2 need both columns, which covers row 0 twice, so there is
+    # no exact cover and the optimizer falls back to the residual model
+    optimizer = BinaryOptimizer(problem=[[1, 1], [1, 0], [0, 1]],
+                                target=[1, 1, 1],
+                                formulation=Formulation.SET_PARTITIONING)
+    print("Optimal x:", optimizer.optimize_binary_vector(),
+          "using", optimizer.used_formulation)
+    # Fewer candidates than the lower bound, only the residual model, which
+    # ignores it, has a solution
+    optimizer = BinaryOptimizer(problem=[[1, 1], [1, 0], [0, 1]],
+                                target=[1, 1, 1],
+                                formulation=Formulation.SET_PARTITIONING,
+                                min_input_vector_sum=3)
+    print("Optimal x:", optimizer.optimize_binary_vector(),
+          "using", optimizer.used_formulation)
+
+    for backend in milpbackends.available_backends():
+        optimizer = BinaryOptimizer(
+            problem=A, target=b, formulation=Formulation.SET_PARTITIONING,
+            backend=milpbackends.create_backend(backend),
+            options=milpbackends.MILPOptions(time_limit=1, threads=2,
+                                             relative_gap=0.01,
+                                             warm_start=[0, 1, 1],
+                                             verbose=False))
+        print(backend, optimizer.optimize_binary_vector(),
+              optimizer.result.status)
+
+    # The exact model of a 48 cell board with 400 random candidates does
+    # not finish within the limit, the residual model or the greedy
+    # partial covering still give an answer
+    A = np.random.default_rng(0).random((48, 400)) < 0.1
+    for backend in milpbackends.available_backends():
+        optimizer = BinaryOptimizer(
+            problem=A, target=np.ones(48, dtype=np.bool_),
+            max_input_vector_sum=9, min_input_vector_sum=8,
+            formulation=Formulation.SET_PARTITIONING,
+            backend=milpbackends.create_backend(backend),
+            options=milpbackends.MILPOptions(time_limit=0.05,
+                                             verbose=False))
+        x = optimizer.optimize_binary_vector()
+        print(backend, "covers", int(np.any(A[:, x], axis=1).sum()),
+              "of 48 cells using", optimizer.used_formulation)
 
 
 if __name__ == "__main__":
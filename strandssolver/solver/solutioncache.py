@@ -0,0 +1,199 @@
+import collections
+import hashlib
+import json
+import os
+import pathlib
+import threading
+import weakref
+import zlib
+import pygtrie
+
+from typing import List, Tuple, Dict, Any, Optional
+
+from strandssolver.models import gamestate, compacttrie
+from strandssolver.dfs.typing import Node
+
+# Fingerprints of pygtrie tries, which take a full walk to compute. Tries
+# are unhashable, so they are keyed by id and checked through a weak
+# reference in case the id was reused
+_dictionary_versions: Dict[int, Tuple[weakref.ref, str]] = {}
+
+
+def dictionary_version(trie: pygtrie.Trie | compacttrie.CompactTrie) -> str:
+    """
+    :return: fingerprint that changes whenever the words in the trie change
+    """
+    if isinstance(trie, compacttrie.CompactTrie):
+        if trie.checksum is not None:
+            return f"compact-crc32:{trie.checksum:08x}"
+        checksum = zlib.crc32(trie.alphabet.encode("utf-8"))
+        for buffer in (trie.child_masks, trie.first_child, trie.terminals):
+            checksum = zlib.crc32(memoryview(buffer).cast("B"), checksum)
+        return f"compact-crc32:{checksum:08x}"
+
+    reference, version = _dictionary_versions.get(id(trie), (None, None))
+    if reference is not None and reference() is trie:
+        return version
+    checksum = 0
+    for key in sorted("".join(key) for key in trie.keys()):
+        checksum = zlib.crc32(key.encode("utf-8") + b"\n", checksum)
+    version = f"keys-crc32:{checksum:08x}"
+    _dictionary_versions[id(trie)] = (weakref.ref(trie), version)
+    return version
+
+
+class SolutionCache:
+    """
+    Content-addressed store for solved boards.
+    A small in-memory LRU sits in front of an optional directory holding
+    one JSON file per key. Disk entries are evicted least recently used
+    first, by modification time, once the directory outgrows
+    max_disk_bytes; a disk hit refreshes the entry's modification time.
+    """
+    DEFAULT_MAX_MEMORY_ENTRIES = 256
+    DEFAULT_MAX_DISK_BYTES = 64 * 1024 * 1024
+    FILE_SUFFIX = ".json"
+
+    def __init__(self, directory: str | os.PathLike = None,
+                 max_memory_entries: int = None,
+                 max_disk_bytes: int = None) -> None:
+        self.directory = None
+        if directory is not None:
+            self.directory = pathlib.Path(directory)
+            self.directory.mkdir(parents=True, exist_ok=True)
+        if max_memory_entries is None:
+            max_memory_entries = SolutionCache.DEFAULT_MAX_MEMORY_ENTRIES
+        self.max_memory_entries = max_memory_entries
+        if max_disk_bytes is None:
+            max_disk_bytes = SolutionCache.DEFAULT_MAX_DISK_BYTES
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: collections.OrderedDict[
+            str, List[Tuple[Node, ...]]] = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(game: gamestate.GameState, dictionary: str,
+            options: Dict[str, Any]) -> str:
+        """
+        :param game: board and word counts; the counts bound the number of
+        words in the covering, so they are part of the key as well
+        :param dictionary: see dictionary_version
+        :param options: solver options that can change the solution
+        :return: hex digest identifying the solve
+        """
+        board = game.board
+        digest = hashlib.sha256()
+        digest.update(repr(tuple(board.shape)).encode("utf-8"))
+        digest.update("\0".join(board.characters.flat).encode("utf-8"))
+        digest.update(board.solved_states.astype(bool).tobytes())
+        digest.update(json.dumps(
+            [game.number_of_total_words, game.number_of_solved_words,
+             dictionary, options], sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[List[Tuple[Node, ...]]]:
+        with self._lock:
+            solution = self._memory.get(key)
+            if solution is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return solution
+        solution = self._read_from_disk(key)
+        with self._lock:
+            if solution is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, solution)
+        return solution
+
+    def put(self, key: str, solution: List[Tuple[Node, ...]]) -> None:
+        solution = [tuple(tuple(node) for node in word) for word in solution]
+        with self._lock:
+            self._remember(key, solution)
+        if self.directory is not None:
+            self._write_to_disk(key, solution)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self.directory is not None:
+            for path in self.directory.glob("*" + SolutionCache.FILE_SUFFIX):
+                path.unlink(missing_ok=True)
+
+    def _remember(self, key: str, solution: List[Tuple[Node, ...]]) -> None:
+        self._memory[key] = solution
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.directory / (key + SolutionCache.FILE_SUFFIX)
+
+    def _read_from_disk(self, key: str) -> Optional[List[Tuple[Node, ...]]]:
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                words = json.load(f)
+            # Mark as recently used for eviction
+            os.utime(path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return [tuple(tuple(node) for node in word) for word in words]
+
+    def _write_to_disk(self, key: str, solution: List[Tuple[Node, ...]]
+                       ) -> None:
+        path = self._path(key)
+        # Write then rename, so readers never see half a file
+        temporary_path = path.with_suffix(f".{os.getpid()}."
+                                          f"{threading.get_ident()}.tmp")
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump([[list(node) for node in word] for word in solution],
+                      f)
+        os.replace(temporary_path, path)
+        self._evict_from_disk()
+
+    def _evict_from_disk(self) -> None:
+        entries = []
+        total_bytes = 0
+        for path in self.directory.glob("*" + SolutionCache.FILE_SUFFIX):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_bytes += stat.st_size
+        if total_bytes <= self.max_disk_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+            if total_bytes <= self.max_disk_bytes:
+                break
+
+
+def _test() -> None:
+    import tempfile
+    from timeit import timeit
+    from strandssolver.test.stubs import stubgamestate
+
+    game = stubgamestate.StubGameState()
+    key = SolutionCache.key(game, "test", {"search_mode": "bitboard"})
+    solution = [((0, 0), (0, 1)), ((1, 0), (1, 1))]
+    with tempfile.TemporaryDirectory() as directory:
+        cache = SolutionCache(directory)
+        print(cache.get(key))
+        cache.put(key, solution)
+        print(cache.get(key) == solution)
+        print(SolutionCache(directory).get(key) == solution)
+        loop = 10000
+        print(timeit(lambda: cache.get(key), number=loop) / loop)
+
+
+if __name__ == "__main__":
+    _test()
@@ -2,61 +2,565 @@ import networkx as nx
 import numpy as np
 import pygtrie
 import collections
+import dataclasses
+import enum
+import itertools
+import concurrent.futures
+import time
 
 from dataclasses import dataclass
-from typing import List, Tuple, Set, Iterable
+from typing import List, Tuple, Set, Iterable, Callable, Optional, Sequence
 
-from strandssolver.models import gamestate
-from strandssolver.solver import strandsdfsvisitor, optimizecovering
-from strandssolver.dfs import depthfirstsearch
-from strandssolver.dfs.typing import Node
+from strandssolver.models import (gamestate, compiledboard, compacttrie,
+                                  lettercountindex)
+from strandssolver.solver import (strandsdfsvisitor, optimizecovering,
+                                  bitboardsearch, exactcover,
+                                  coveringexceptions, spangram,
+                                  candidatereduction, solutioncache,
+                                  incidencematrix, solverstats,
+                                  candidateclasses, milpbackends,
+                                  greedycovering)
+from strandssolver.dfs import depthfirstsearch, iterativedepthfirstsearch
+from strandssolver.dfs.typing import Node, Edge
+
+
+class SearchMode(enum.Enum):
+    VISITOR = "visitor"
+    ITERATIVE_VISITOR = "iterative_visitor"
+    BITBOARD = "bitboard"
+
+
+class CoveringBackend(enum.Enum):
+    MILP = "milp"
+    EXACT_COVER = "exact_cover"
+
+
+# Dictionary trie each pool worker searches, set once per process
+_worker_trie: Optional[pygtrie.Trie | compacttrie.CompactTrie] = None
+
+
+def _initialize_worker(trie: pygtrie.Trie | compacttrie.CompactTrie
+                       ) -> None:
+    global _worker_trie
+    _worker_trie = trie
+
+
+def _find_words_in_worker(solver: "Solver", nodes: Sequence[Node]
+                          ) -> Tuple[List[Tuple[Node]],
+                                     solverstats.SearchCounters]:
+    # Tasks leave out the dictionary trie, the worker already holds it
+    if solver.trie is None:
+        solver.trie = _worker_trie
+    solver.search_counters = solverstats.SearchCounters()
+    words = solver.find_words_from_nodes(nodes)
+    return words, solver.search_counters
+
+
+def create_search_executor(trie: pygtrie.Trie | compacttrie.CompactTrie,
+                           workers: int = None
+                           ) -> concurrent.futures.ProcessPoolExecutor:
+    """
+    Process pool that can be shared by every Solver with this trie, see
+    Solver.executor. The caller shuts it down.
+    """
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, initializer=_initialize_worker,
+        initargs=(trie,))
 
 
 @dataclass
 class Solver:
+    DEFAULT_DEPTH_LIMIT = 8
+    # Chunks handed out per worker, more chunks balance uneven start cells
+    CHUNKS_PER_WORKER = 4
+    # Fields that do not change the solution, left out of cache keys
+    NON_SOLUTION_FIELDS = ("graph", "game", "trie", "workers", "cache",
+                           "candidates", "problem", "search_counters",
+                           "letter_count_index", "board_trie",
+                           "candidate_classes", "milp_threads",
+                           "fallback_candidates", "executor", "_pool",
+                           "_pool_trie")
+
     graph: nx.Graph
     game: gamestate.GameState
-    trie: pygtrie.Trie
+    trie: pygtrie.Trie | compacttrie.CompactTrie
+    search_mode: SearchMode = SearchMode.VISITOR
+    # Processes searching start cells in parallel, None or 1 searches inline
+    workers: Optional[int] = None
+    # Pool from create_search_executor for this solver's trie, used instead
+    # of a pool of its own when workers is above 1 and never shut down here
+    executor: Optional[concurrent.futures.Executor] = dataclasses.field(
+        default=None, compare=False)
+    covering_backend: CoveringBackend = CoveringBackend.MILP
+    formulation: optimizecovering.Formulation = \
+        optimizecovering.Formulation.SET_PARTITIONING
+    # Try a budgeted greedy tiling before the MILP, which is then only run
+    # if the greedy search found no exact cover and starts from its best
+    # partial covering
+    greedy_presolve: bool = True
+    milp_backend: milpbackends.Backend = milpbackends.Backend.CBC
+    # Seconds for the whole MILP covering, None waits for the optimum
+    milp_time_limit: Optional[float] = None
+    milp_threads: Optional[int] = None
+    milp_relative_gap: Optional[float] = None
+    # Require exactly one word touching two opposite sides of the board.
+    # Off by default: a spangram longer than the depth limit is only found
+    # in pieces, and an ordinary word across a row also touches two sides,
+    # so the row can rule out the true tiling
+    require_spangram: bool = False
+    # Drop candidates that cannot be part of any exact cover before covering
+    prune_candidates: bool = False
+    # Give paths over the same cells a single column in the problem matrix
+    deduplicate_candidates: bool = True
+    # Previously solved boards are answered from here without searching
+    cache: Optional[solutioncache.SolutionCache] = None
+    # Search a trie of only the dictionary words the board's letters can
+    # spell, built from this index, instead of the whole trie
+    letter_count_index: Optional[lettercountindex.LetterCountIndex] = None
+    board_trie: Optional[compacttrie.CompactTrie] = dataclasses.field(
+        default=None, init=False, repr=False)
+    # Every path found per cell set in the last solve, see alternative_paths
+    candidate_classes: Optional[candidateclasses.CandidateClasses] = \
+        dataclasses.field(default=None, init=False, repr=False)
+    # Candidate words and their problem matrix from the last solve, kept for
+    # resolve_after_solving
+    candidates: Optional[List[Tuple[Node]]] = dataclasses.field(
+        default=None, init=False, repr=False)
+    problem: Optional[incidencematrix.IncidenceMatrix] = dataclasses.field(
+        default=None, init=False, repr=False)
+    # Candidates before pruning when it dropped any, the residual model
+    # searches these
+    fallback_candidates: Optional[List[Tuple[Node]]] = dataclasses.field(
+        default=None, init=False, repr=False)
+    # Accumulated by every word search this solver runs
+    search_counters: solverstats.SearchCounters = dataclasses.field(
+        default_factory=solverstats.SearchCounters, init=False, repr=False)
+    # Pool created by the first parallel search and the trie it holds,
+    # kept for later searches until close
+    _pool: Optional[concurrent.futures.ProcessPoolExecutor] = \
+        dataclasses.field(default=None, init=False, repr=False,
+                          compare=False)
+    _pool_trie: Optional[pygtrie.Trie | compacttrie.CompactTrie] = \
+        dataclasses.field(default=None, init=False, repr=False,
+                          compare=False)
+
+    def __enter__(self) -> "Solver":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Shuts down the process pool this solver created, not executor.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._pool_trie = None
+
+    def solve(self, stats: Optional[solverstats.SolverStats] = None
+              ) -> List[Tuple[Node]]:
+        """
+        :param stats: filled with timings and counters of this solve
+        """
+        if stats is None:
+            stats = solverstats.SolverStats()
+        key = None
+        if self.cache is not None:
+            key = self.cache_key()
+            cached = self.cache.get(key)
+            if cached is not None:
+                stats.cache_hit = True
+                return list(cached)
+        if self.letter_count_index is not None:
+            with stats.timer("board_trie_build"):
+                self.board_trie = self.build_board_trie()
+            stats.board_trie_words = len(self.board_trie)
+        self.search_counters = solverstats.SearchCounters()
+        with stats.timer("search"):
+            words = self.find_all_words()
+            self.candidate_classes = None
+            if self.deduplicate_candidates:
+                self.candidate_classes = candidateclasses.CandidateClasses(
+                    words)
+                words = self.candidate_classes.representatives
+                stats.duplicate_candidates = \
+                    self.candidate_classes.number_of_paths - len(words)
+            self.fallback_candidates = None
+            if self.prune_candidates:
+                reduced_words = self.reduce_candidates(words)
+                if len(reduced_words) < len(words):
+                    self.fallback_candidates = words
+                words = reduced_words
+        stats.search = self.search_counters
+        stats.count_candidates(words)
+        self.candidates = words
+        with stats.timer("matrix_build"):
+            self.problem = \
+                optimizecovering.convert_words_to_sparse_problem_matrix(
+                    words, self.graph)
+        with stats.timer("covering"):
+            covering = list(self.find_best_covering(
+                words, self.problem, stats,
+                fallback_words=self.fallback_candidates))
+        if self.cache is not None:
+            self.cache.put(key, covering)
+        return covering
+
+    def solve_with_stats(self, stats: Optional[solverstats.SolverStats] = None
+                         ) -> Tuple[List[Tuple[Node]],
+                                    solverstats.SolverStats]:
+        """
+        :param stats: e.g. with graph_build and trie_load already timed
+        :return: the covering and the stats of the solve
+        """
+        if stats is None:
+            stats = solverstats.SolverStats()
+        return self.solve(stats), stats
+
+    def resolve_after_solving(self, solved_nodes: Iterable[Node],
+                              number_of_newly_solved_words: int = 1
+                              ) -> List[Tuple[Node]]:
+        """
+        Re-runs only the covering after words were found during play.
+        The solved cells are marked on the board and removed from the graph,
+        and every candidate overlapping them is dropped from the candidates
+        and the problem matrix, all in place.
+        Without candidates from a previous solve (e.g. it was answered from
+        the cache) this falls back to a full solve.
+        :param solved_nodes: cells of the newly solved words
+        :param number_of_newly_solved_words: how many words they make up
+        :return: covering of the remaining cells
+        """
+        solved_nodes = set(solved_nodes) & set(self.graph.nodes)
+        for node in solved_nodes:
+            self.game.board.solved_states[node] = True
+        self.game.number_of_solved_words += number_of_newly_solved_words
+        if self.candidates is None or self.problem is None:
+            self.graph.remove_nodes_from(solved_nodes)
+            return self.solve()
+
+        # Rows follow the graph's node order, look them up before removal
+        solved_rows = [row for row, node in enumerate(self.graph.nodes)
+                       if node in solved_nodes]
+        overlapping_columns = [column
+                               for column, word in enumerate(self.candidates)
+                               if not solved_nodes.isdisjoint(word)]
+        self.graph.remove_nodes_from(solved_nodes)
+        self.problem.remove(solved_rows, overlapping_columns)
+        self.candidates[:] = [word for word in self.candidates
+                              if solved_nodes.isdisjoint(word)]
+        if self.fallback_candidates is not None:
+            self.fallback_candidates[:] = [
+                word for word in self.fallback_candidates
+                if solved_nodes.isdisjoint(word)]
+        return list(self.find_best_covering(
+            self.candidates, self.problem,
+            fallback_words=self.fallback_candidates))
 
-    def solve(self) -> List[Tuple[Node]]:
-        words = self.find_all_words()
-        covering = self.find_best_covering(words)
-        return list(covering)
+    def alternative_paths(self, word: Tuple[Node]) -> List[Tuple[Node]]:
+        """
+        :param word: a word of the covering
+        :return: every path the last solve found over the same cells,
+        word's own path first
+        """
+        if self.candidate_classes is None:
+            return [word]
+        return self.candidate_classes.paths(word) or [word]
+
+    def cache_key(self) -> str:
+        options = {"depth_limit": Solver.DEFAULT_DEPTH_LIMIT}
+        for field in dataclasses.fields(self):
+            if field.name in Solver.NON_SOLUTION_FIELDS:
+                continue
+            value = getattr(self, field.name)
+            if isinstance(value, enum.Enum):
+                value = value.value
+            options[field.name] = value
+        if self.letter_count_index is not None:
+            # The board trie leaves out words shorter than this
+            options["min_word_length"] = \
+                lettercountindex.LetterCountIndex.MIN_WORD_LENGTH
+        return solutioncache.SolutionCache.key(
+            self.game, solutioncache.dictionary_version(self.trie), options)
+
+    def build_board_trie(self) -> compacttrie.CompactTrie:
+        # Words longer than the depth limit are never reached anyway
+        return self.letter_count_index.build_board_trie(
+            self.game.board, max_length=Solver.DEFAULT_DEPTH_LIMIT)
+
+    def search_trie(self) -> pygtrie.Trie | compacttrie.CompactTrie:
+        if self.board_trie is not None:
+            return self.board_trie
+        return self.trie
 
     def find_all_words(self) -> List[Tuple[Node]]:
+        if self.letter_count_index is not None and self.board_trie is None:
+            self.board_trie = self.build_board_trie()
+        nodes = list(self.graph.nodes())
+        if self.workers is None or self.workers <= 1:
+            return self.find_words_from_nodes(nodes)
+        return self._find_all_words_in_pool(nodes)
+
+    def find_words_from_nodes(self, nodes: Sequence[Node]
+                              ) -> List[Tuple[Node]]:
+        if self.search_mode is SearchMode.BITBOARD:
+            return self._find_words_on_bitboard(nodes)
+        if self.search_mode is SearchMode.ITERATIVE_VISITOR:
+            return self._find_words_with_visitor(
+                nodes, iterativedepthfirstsearch.dfs_edges)
+        return self._find_words_with_visitor(nodes,
+                                             depthfirstsearch.dfs_edges)
+
+    def _find_all_words_in_pool(self, nodes: List[Node]
+                                ) -> List[Tuple[Node]]:
+        number_of_chunks = min(len(nodes),
+                               self.workers * Solver.CHUNKS_PER_WORKER)
+        if number_of_chunks <= 1:
+            return self.find_words_from_nodes(nodes)
+        # Contiguous chunks merged in submission order give the same word
+        # order as searching inline
+        chunk_size = -(-len(nodes) // number_of_chunks)
+        chunks = [nodes[i:i + chunk_size]
+                  for i in range(0, len(nodes), chunk_size)]
+
+        # The dictionary trie travels to each worker once with the
+        # initializer, tasks carry the board and a board trie if there is one
+        worker_solver = dataclasses.replace(
+            self, trie=self.board_trie, letter_count_index=None,
+            workers=None, executor=None, cache=None)
         words = []
+        for chunk_words, counters in self.search_executor().map(
+                _find_words_in_worker, itertools.repeat(worker_solver),
+                chunks):
+            words.extend(chunk_words)
+            self.search_counters.add(counters)
+        return words
+
+    def search_executor(self) -> concurrent.futures.Executor:
+        if self.executor is not None:
+            return self.executor
+        if self._pool is not None and self._pool_trie is not self.trie:
+            self.close()
+        if self._pool is None:
+            self._pool = create_search_executor(self.trie, self.workers)
+            self._pool_trie = self.trie
+        return self._pool
 
-        for node in self.graph.nodes():
+    def _find_words_with_visitor(
+            self, nodes: Sequence[Node],
+            dfs_edges: Callable[..., Iterable[Edge]]
+    ) -> List[Tuple[Node]]:
+        words = []
+
+        for node in nodes:
             visitor = strandsdfsvisitor.StrandsDFSVisitor(self.graph,
-                                                          self.trie)
-            edges = depthfirstsearch.dfs_edges(self.graph, source=node,
-                                               depth_limit=8,
-                                               dfs_visitor=visitor)
+                                                          self.search_trie())
+            edges = dfs_edges(
+                self.graph, source=node,
+                depth_limit=Solver.DEFAULT_DEPTH_LIMIT,
+                dfs_visitor=visitor)
             # Exhaust the iterator so the visitor builds all words
             collections.deque(edges, maxlen=0)
             words.extend(visitor.words.keys())
+            self.search_counters.add(visitor.counters)
 
         return words
 
-    def find_best_covering(self, words: Iterable[Tuple[Node]]
-                           ) -> Iterable[Tuple[Node]]:
-        problem = optimizecovering.convert_words_to_problem_matrix(words,
-                                                                   self.graph)
+    def _find_words_on_bitboard(self, nodes: Sequence[Node]
+                                ) -> List[Tuple[Node]]:
+        board = compiledboard.CompiledBoardBuilder.\
+            build_compiled_board_from_board(self.game.board)
+        search = bitboardsearch.BitboardWordSearch(
+            board, self.search_trie(),
+            depth_limit=Solver.DEFAULT_DEPTH_LIMIT)
+        # Same start order as the visitor path so the word lists line up
+        for node in nodes:
+            search.search_from_node(node)
+        self.search_counters.add(search.counters)
+        return list(search.words.keys())
+
+    def reduce_candidates(self, words: Iterable[Tuple[Node]]
+                          ) -> List[Tuple[Node]]:
+        board = compiledboard.CompiledBoardBuilder.\
+            build_compiled_board_from_board(self.game.board)
+        reducer = candidatereduction.CandidateReducer(
+            board, max_number_of_words=self._max_number_of_words())
+        return reducer.reduce(list(words))
+
+    def find_best_covering(
+            self, words: Iterable[Tuple[Node]],
+            problem: Optional[incidencematrix.IncidenceMatrix] = None,
+            stats: Optional[solverstats.SolverStats] = None,
+            warm_start: Optional[np.typing.ArrayLike] = None,
+            fallback_words: Optional[Iterable[Tuple[Node]]] = None
+    ) -> Iterable[Tuple[Node]]:
+        """
+        :param words: candidate words
+        :param problem: their cell/word matrix over the graph's nodes, built
+        from words if None
+        :param stats: receives the problem size and covering timings
+        :param warm_start: one flag per word, a covering the MILP backend
+        starts from
+        :param fallback_words: e.g. the candidates before pruning, words
+        then only go to the exact models and the closest covering is
+        searched among fallback_words if they find no exact cover
+        """
+        if stats is None:
+            stats = solverstats.SolverStats()
+        words = list(words)
+        problem, target = self._covering_problem(words, problem)
+
+        stats.problem_rows, stats.problem_columns = problem.shape
+        stats.problem_nonzeros = problem.nnz
+        min_number_of_words_in_solution = self._min_number_of_words()
+        max_number_of_words_in_solution = self._max_number_of_words()
+        solution = None
+        if self.covering_backend is CoveringBackend.EXACT_COVER:
+            exact_cover_solver = exactcover.ExactCoverSolver(
+                problem,
+                target,
+                max_number_of_words_in_solution,
+                min_input_vector_sum=min_number_of_words_in_solution
+            )
+            try:
+                solution = exact_cover_solver.optimize_binary_vector()
+            except coveringexceptions.NoExactCoverError:
+                # E.g. a word missing from the dictionary, only the
+                # optimizer can find the closest covering then
+                pass
+            stats.exact_cover_search_nodes = \
+                exact_cover_solver.number_of_search_nodes
+        elif self.greedy_presolve:
+            greedy_solver = greedycovering.GreedyCoveringSolver(
+                problem,
+                target,
+                max_number_of_words_in_solution,
+                min_input_vector_sum=min_number_of_words_in_solution
+            )
+            with stats.timer("greedy"):
+                try:
+                    solution = greedy_solver.optimize_binary_vector()
+                except coveringexceptions.NoExactCoverError:
+                    if warm_start is None:
+                        warm_start = greedy_solver.incumbent_vector()
+            stats.greedy_search_nodes = greedy_solver.number_of_search_nodes
+            stats.greedy_solved = solution is not None
+        if solution is not None:
+            return optimizecovering.convert_problem_solution_to_words(
+                solution, words)
+        if fallback_words is None:
+            solution = self._optimize(problem, target, self.formulation,
+                                      warm_start, stats,
+                                      self.milp_time_limit)
+            return optimizecovering.convert_problem_solution_to_words(
+                solution, words)
+
+        time_limit = self.milp_time_limit
+        # Algorithm X already searched every exact cover
+        if self.covering_backend is not CoveringBackend.EXACT_COVER \
+                and self.formulation is \
+                optimizecovering.Formulation.SET_PARTITIONING:
+            start = time.perf_counter()
+            try:
+                solution = self._optimize(
+                    problem, target,
+                    optimizecovering.Formulation.SET_PARTITIONING,
+                    warm_start, stats, time_limit, residual_fallback=False)
+                return optimizecovering.convert_problem_solution_to_words(
+                    solution, words)
+            except coveringexceptions.NoExactCoverError:
+                pass
+            if time_limit is not None:
+                # Same split as BinaryOptimizer between its two models
+                time_limit = max(
+                    time_limit - (time.perf_counter() - start),
+                    time_limit * (1 - optimizecovering.BinaryOptimizer
+                                  .EXACT_TIME_SHARE))
+        # The pruning assumed an exact cover exists, the closest covering
+        # may need the words it dropped
+        fallback_words = list(fallback_words)
+        if warm_start is not None:
+            chosen = set(optimizecovering.convert_problem_solution_to_words(
+                warm_start, words))
+            warm_start = np.fromiter((word in chosen
+                                      for word in fallback_words),
+                                     dtype=np.bool_,
+                                     count=len(fallback_words))
+        problem, target = self._covering_problem(fallback_words)
+        solution = self._optimize(problem, target,
+                                  optimizecovering.Formulation.RESIDUAL,
+                                  warm_start, stats, time_limit)
+        return optimizecovering.convert_problem_solution_to_words(
+            solution, fallback_words)
+
+    def _covering_problem(
+            self, words: List[Tuple[Node]],
+            problem: Optional[incidencematrix.IncidenceMatrix] = None
+    ) -> Tuple[incidencematrix.IncidenceMatrix, np.typing.NDArray[np.bool_]]:
+        if problem is None:
+            problem = \
+                optimizecovering.convert_words_to_sparse_problem_matrix(
+                    words, self.graph)
         target = np.ones(len(self.graph.nodes), dtype=np.bool_).T
+        if self._should_require_spangram(words):
+            sides = spangram.index_words_by_sides(words,
+                                                  self.game.board.shape)
+            problem, target = spangram.add_spangram_row(problem, target,
+                                                        sides)
+        return problem, target
 
-        max_number_of_words_in_solution = (self.game.number_of_total_words
-                                           - self.game.number_of_solved_words)
-        # Sometimes the spangram is a compound word so add 1 to be safe
-        max_number_of_words_in_solution += 1
+    def _optimize(self, problem: incidencematrix.IncidenceMatrix,
+                  target: np.typing.NDArray[np.bool_],
+                  formulation: optimizecovering.Formulation,
+                  warm_start: Optional[np.typing.ArrayLike],
+                  stats: solverstats.SolverStats,
+                  time_limit: Optional[float],
+                  residual_fallback: bool = True
+                  ) -> np.typing.NDArray[np.bool_]:
         optimizer = optimizecovering.BinaryOptimizer(
             problem,
             target,
-            max_number_of_words_in_solution
+            self._max_number_of_words(),
+            formulation=formulation,
+            min_input_vector_sum=self._min_number_of_words(),
+            backend=milpbackends.create_backend(self.milp_backend),
+            options=milpbackends.MILPOptions(
+                time_limit=time_limit,
+                threads=self.milp_threads,
+                relative_gap=self.milp_relative_gap,
+                warm_start=warm_start),
+            residual_fallback=residual_fallback
         )
-        solution = optimizer.optimize_binary_vector()
-        covering = optimizecovering.convert_problem_solution_to_words(solution,
-                                                                      words)
-        return covering
+        try:
+            return optimizer.optimize_binary_vector()
+        finally:
+            stats.ilp_build_seconds += optimizer.build_seconds
+            stats.ilp_solve_seconds += optimizer.solve_seconds
+            if optimizer.result is not None:
+                stats.ilp_backend = optimizer.result.backend.value
+                stats.ilp_status = optimizer.result.status.value
+
+    def _min_number_of_words(self) -> int:
+        # Every remaining theme word needs at least one dictionary word
+        return (self.game.number_of_total_words
+                - self.game.number_of_solved_words)
+
+    def _max_number_of_words(self) -> int:
+        # Sometimes the spangram is a compound word so add 1 to be safe
+        return self._min_number_of_words() + 1
+
+    def _should_require_spangram(self, words: List[Tuple[Node]]) -> bool:
+        if not self.require_spangram:
+            return False
+        # A solved word may already be the spangram
+        if self.game.number_of_solved_words > 0:
+            return False
+        # Without any candidate the row could never be covered
+        shape = self.game.board.shape
+        return any(spangram.is_spangram_candidate(
+            spangram.sides_touched(word, shape)) for word in words)
 
 
 def _test() -> None:
@@ -69,6 +573,50 @@ def _test() -> None:
 
     solver = Solver(graph=graph, game=game, trie=trie)
     solution = solver.solve()
+    bitboard_solver = Solver(graph=graph, game=game, trie=trie,
+                             search_mode=SearchMode.BITBOARD)
+    print(set(solver.find_all_words()) == set(
+        bitboard_solver.find_all_words()))
+    with Solver(graph=graph, game=game, trie=trie,
+                search_mode=SearchMode.BITBOARD, workers=4) as parallel_solver:
+        # The second search reuses the pool the first one started
+        for _ in range(2):
+            print(parallel_solver.find_all_words() ==
+                  bitboard_solver.find_all_words())
+    no_spangram_solver = Solver(graph=graph, game=game, trie=trie,
+                                search_mode=SearchMode.BITBOARD,
+                                require_spangram=False)
+    print(sorted(map(frozenset, no_spangram_solver.solve())) ==
+          sorted(map(frozenset, solution)))
+    duplicates_solver = Solver(graph=graph, game=game, trie=trie,
+                               search_mode=SearchMode.BITBOARD,
+                               deduplicate_candidates=False)
+    print(sorted(map(frozenset, duplicates_solver.solve())) ==
+          sorted(map(frozenset, solution)))
+    pruning_solver = Solver(graph=graph, game=game, trie=trie,
+                            search_mode=SearchMode.BITBOARD,
+                            prune_candidates=True)
+    print(sorted(map(frozenset, pruning_solver.solve())) ==
+          sorted(map(frozenset, solution)))
+    for backend in milpbackends.available_backends():
+        backend_solver = Solver(graph=graph, game=game, trie=trie,
+                                search_mode=SearchMode.BITBOARD,
+                                milp_backend=backend, milp_time_limit=10)
+        print(backend, sorted(map(frozenset, backend_solver.solve())) ==
+              sorted(map(frozenset, solution)))
+    exact_cover_solver = Solver(graph=graph, game=game, trie=trie,
+                                search_mode=SearchMode.BITBOARD,
+                                covering_backend=CoveringBackend.EXACT_COVER)
+    print(sorted(map(frozenset, exact_cover_solver.solve())) ==
+          sorted(map(frozenset, solution)))
+    index = lettercountindex.LetterCountIndexBuilder.build_from_trie(trie)
+    board_trie_solver = Solver(graph=graph, game=game, trie=trie,
+                               search_mode=SearchMode.BITBOARD,
+                               letter_count_index=index)
+    print(sorted(map(frozenset, board_trie_solver.solve())) ==
+          sorted(map(frozenset, solution)))
+    _, stats = board_trie_solver.solve_with_stats()
+    print(stats.to_json())
     for word in solution:
         string = ""
         for node in word:
@@ -0,0 +1,154 @@
+import collections
+import contextlib
+import dataclasses
+import json
+import time
+
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Tuple, Iterable
+
+from strandssolver.dfs.typing import Node
+
+
+@dataclass
+class SearchCounters:
+    vertices_discovered: int = 0
+    prunes: int = 0
+    trie_lookups: int = 0
+
+    def add(self, other: "SearchCounters") -> None:
+        self.vertices_discovered += other.vertices_discovered
+        self.prunes += other.prunes
+        self.trie_lookups += other.trie_lookups
+
+
+@dataclass
+class SolverStats:
+    """
+    Where a solve spent its time and how large its search and covering
+    problem were. Stages that did not run keep their zero.
+    Graph building and trie loading happen before a Solver exists, time
+    them with stats.timer("graph_build") and stats.timer("trie_load").
+    """
+    graph_build_seconds: float = 0.0
+    trie_load_seconds: float = 0.0
+    board_trie_build_seconds: float = 0.0
+    search_seconds: float = 0.0
+    matrix_build_seconds: float = 0.0
+    # Everything after the matrix exists, ilp_* is the MILP's share of it
+    covering_seconds: float = 0.0
+    greedy_seconds: float = 0.0
+    ilp_build_seconds: float = 0.0
+    ilp_solve_seconds: float = 0.0
+    # MILP backend and status of the last model, empty if none ran
+    ilp_backend: str = ""
+    ilp_status: str = ""
+    search: SearchCounters = dataclasses.field(default_factory=SearchCounters)
+    candidates_per_length: Dict[int, int] = dataclasses.field(
+        default_factory=dict)
+    # Paths dropped because another candidate covers the same cells
+    duplicate_candidates: int = 0
+    # Words in the board's sub-trie, 0 when searching the whole trie
+    board_trie_words: int = 0
+    problem_rows: int = 0
+    problem_columns: int = 0
+    problem_nonzeros: int = 0
+    exact_cover_search_nodes: int = 0
+    greedy_search_nodes: int = 0
+    # The greedy pre-solve found an exact cover, so no MILP ran
+    greedy_solved: bool = False
+    cache_hit: bool = False
+
+    PROMETHEUS_PREFIX = "strands_solver"
+
+    @contextlib.contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """
+        Adds the wall time of the block to <stage>_seconds.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            attribute = f"{stage}_seconds"
+            setattr(self, attribute, getattr(self, attribute)
+                    + time.perf_counter() - start)
+
+    def count_candidates(self, words: Iterable[Tuple[Node, ...]]) -> None:
+        counts = collections.Counter(len(word) for word in words)
+        self.candidates_per_length = dict(sorted(counts.items()))
+
+    def to_dict(self) -> Dict:
+        return dataclasses.asdict(self)
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_prometheus(self, labels: Dict[str, str] = None) -> str:
+        """
+        :param labels: added to every sample, e.g. {"board": "2024-05-01"}
+        :return: metrics in the Prometheus text exposition format
+        """
+        prefix = SolverStats.PROMETHEUS_PREFIX
+        if labels is None:
+            labels = {}
+        lines: List[str] = []
+        typed_metrics = set()
+
+        def sample(name: str, kind: str, value: float,
+                   extra_labels: Dict[str, str] = None) -> None:
+            all_labels = dict(labels, **(extra_labels or {}))
+            label_text = ",".join(
+                f'{key}="{_escape_label_value(str(label))}"'
+                for key, label in all_labels.items())
+            if label_text:
+                label_text = "{" + label_text + "}"
+            metric = f"{prefix}_{name}"
+            if metric not in typed_metrics:
+                typed_metrics.add(metric)
+                lines.append(f"# TYPE {metric} {kind}")
+            lines.append(f"{metric}{label_text} {value}")
+
+        for stage in ("graph_build", "trie_load", "board_trie_build",
+                      "search", "matrix_build", "covering", "greedy",
+                      "ilp_build", "ilp_solve"):
+            sample("stage_seconds", "gauge",
+                   getattr(self, f"{stage}_seconds"), {"stage": stage})
+        for counter, value in dataclasses.asdict(self.search).items():
+            sample(f"search_{counter}", "gauge", value)
+        for length, count in self.candidates_per_length.items():
+            sample("candidates", "gauge", count, {"length": str(length)})
+        if self.ilp_status:
+            sample("ilp_info", "gauge", 1, {"backend": self.ilp_backend,
+                                            "status": self.ilp_status})
+        sample("duplicate_candidates", "gauge", self.duplicate_candidates)
+        sample("board_trie_words", "gauge", self.board_trie_words)
+        sample("problem_rows", "gauge", self.problem_rows)
+        sample("problem_columns", "gauge", self.problem_columns)
+        sample("problem_nonzeros", "gauge", self.problem_nonzeros)
+        sample("exact_cover_search_nodes", "gauge",
+               self.exact_cover_search_nodes)
+        sample("greedy_search_nodes", "gauge", self.greedy_search_nodes)
+        sample("greedy_solved", "gauge", int(self.greedy_solved))
+        sample("cache_hit", "gauge", int(self.cache_hit))
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label_value(value: str) -> str:
+    return (value.replace("\\", "\\\\").replace("\n", "\\n")
+            .replace('"', '\\"'))
+
+
+def _test() -> None:
+    stats = SolverStats()
+    with stats.timer("search"):
+        time.sleep(0.01)
+    stats.search.add(SearchCounters(vertices_discovered=3, prunes=1,
+                                    trie_lookups=5))
+    stats.count_candidates([((0, 0), (0, 1)), ((1, 1), (1, 2), (2, 2))])
+    print(stats.to_json())
+    print(stats.to_prometheus({"board": "stub"}))
+
+
+if __name__ == "__main__":
+    _test()
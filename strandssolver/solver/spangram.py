@@ -0,0 +1,82 @@
+import enum
+import numpy as np
+import numpy.typing
+
+from typing import Iterable, Tuple, List
+
+from strandssolver.solver import incidencematrix
+from strandssolver.dfs.typing import Node
+
+
+class BoardSide(enum.IntFlag):
+    NONE = 0
+    TOP = enum.auto()
+    BOTTOM = enum.auto()
+    LEFT = enum.auto()
+    RIGHT = enum.auto()
+
+
+def sides_touched(word: Tuple[Node, ...], shape: Tuple[int, ...]
+                  ) -> BoardSide:
+    """
+    :param word: path of (row, column) nodes
+    :param shape: (rows, columns) of the board
+    :return: the board sides the path has a cell on
+    """
+    rows, columns = shape[0], shape[1]
+    sides = BoardSide.NONE
+    for row, column in word:
+        if row == 0:
+            sides |= BoardSide.TOP
+        if row == rows - 1:
+            sides |= BoardSide.BOTTOM
+        if column == 0:
+            sides |= BoardSide.LEFT
+        if column == columns - 1:
+            sides |= BoardSide.RIGHT
+    return sides
+
+
+def is_spangram_candidate(sides: BoardSide) -> bool:
+    # The spangram touches two opposite sides of the board
+    return ((BoardSide.TOP | BoardSide.BOTTOM) in sides
+            or (BoardSide.LEFT | BoardSide.RIGHT) in sides)
+
+
+def index_words_by_sides(words: Iterable[Tuple[Node, ...]],
+                         shape: Tuple[int, ...]) -> List[BoardSide]:
+    return [sides_touched(word, shape) for word in words]
+
+
+def add_spangram_row(problem: incidencematrix.IncidenceMatrix,
+                     target: np.typing.NDArray[np.bool_],
+                     sides: List[BoardSide]
+                     ) -> Tuple[incidencematrix.IncidenceMatrix,
+                                np.typing.NDArray[np.bool_]]:
+    """
+    Appends a row set for every spangram candidate with a target of 1, so
+    an exact cover uses exactly one spangram-class word.
+    :param problem: (n x m) cell/word incidence matrix
+    :param target: (n x 1) target vector
+    :param sides: sides touched by each of the m words
+    :return: ((n + 1) x m) problem and (n + 1) x 1 target
+    """
+    spangram_columns = np.fromiter(
+        (is_spangram_candidate(word_sides) for word_sides in sides),
+        dtype=np.bool_, count=len(sides))
+    return (problem.append_row(spangram_columns),
+            np.append(target, True))
+
+
+def _test() -> None:
+    shape = (8, 6)
+    print(repr(sides_touched(((0, 2), (1, 2)), shape)))
+    vertical = tuple((row, 3) for row in range(8))
+    horizontal = tuple((4, column) for column in range(6))
+    for word in (vertical, horizontal, ((3, 3), (4, 4))):
+        sides = sides_touched(word, shape)
+        print(repr(sides), is_spangram_candidate(sides))
+
+
+if __name__ == "__main__":
+    _test()
@@ -1,21 +1,28 @@
 import networkx as nx
 import pygtrie
 
-from typing import override, Any
+from typing import override, Any, Optional
 
-from strandssolver.models import graph as ssgraph
-from strandssolver.dfs import dfsvisitor, dfsexceptions
+from strandssolver.models import graph as ssgraph, compacttrie
+from strandssolver.solver import solverstats
+from strandssolver.dfs import dfsvisitor
+from strandssolver.dfs.dfsaction import DFSAction
 from strandssolver.dfs.typing import Vertex, Edge
 
 
 class StrandsDFSVisitor(dfsvisitor.IdleDFSVisitor):
     @override
-    def __init__(self, graph: nx.Graph, trie: pygtrie.Trie) -> None:
+    def __init__(self, graph: nx.Graph,
+                 trie: pygtrie.Trie | compacttrie.CompactTrie) -> None:
         self.graph = graph
         self.trie = trie
         self.current_prefix = ""
         self.current_path = []
+        # Trie state per vertex on the path, only tracked for a CompactTrie
+        self.current_states = []
+        self.tracks_states = isinstance(trie, compacttrie.CompactTrie)
         self.words = {}
+        self.counters = solverstats.SearchCounters()
 
     def backtrack_until_vertex(self, vertex: Vertex) -> int:
         if len(self.current_path) <= 0:
@@ -46,28 +53,70 @@ class StrandsDFSVisitor(dfsvisitor.IdleDFSVisitor):
         steps_backtracked = self.backtrack_until_vertex(origin)
         if steps_backtracked > 0:
             self.current_prefix = self.current_prefix[:-steps_backtracked]
+            if self.tracks_states:
+                del self.current_states[-steps_backtracked:]
+
+    def step_state(self, character: str) -> int:
+        if self.current_states:
+            state = self.current_states[-1]
+        else:
+            state = self.trie.root
+        if state < 0:
+            return state
+        return self.trie.step(state, character)
 
     @override
-    def discover_vertex(self, vertex: Vertex, **kwargs) -> None:
+    def discover_vertex(self, vertex: Vertex, **kwargs
+                        ) -> Optional[DFSAction]:
+        character = self.get_character_from_vertex(vertex).lower()
         self.current_path.append(vertex)
-        self.current_prefix += self.get_character_from_vertex(vertex).lower()
+        self.current_prefix += character
+        self.counters.vertices_discovered += 1
+        self.counters.trie_lookups += 1
+        # Words are recorded before pruning, a word that is no prefix of
+        # another word still counts
+        if self.tracks_states:
+            state = self.step_state(character)
+            self.current_states.append(state)
+            if state < 0:
+                self.counters.prunes += 1
+                return DFSAction.PRUNE_SEARCH
+            if self.trie.is_word(state):
+                self.words[tuple(self.current_path)] = self.current_prefix
+            if not self.trie.has_children(state):
+                self.counters.prunes += 1
+                return DFSAction.PRUNE_SEARCH
+            return
         if self.current_prefix == "kem":
             pass
-        if not self.trie.has_subtrie(self.current_prefix):
-            raise dfsexceptions.PruneSearch
-        if self.trie.has_key(self.current_prefix):
+        node = self.trie.has_node(self.current_prefix)
+        if node & pygtrie.Trie.HAS_VALUE:
             self.words[tuple(self.current_path)] = self.current_prefix
+        if not node & pygtrie.Trie.HAS_SUBTRIE:
+            self.counters.prunes += 1
+            return DFSAction.PRUNE_SEARCH
 
     @override
-    def finish_vertex(self, vertex: Vertex, **kwargs) -> None:
-        kwargs['dfs_completed'].remove(vertex)
+    def finish_vertex(self, vertex: Vertex, **kwargs
+                      ) -> Optional[DFSAction]:
         self.current_path.pop()
         self.current_prefix = self.current_prefix[:-1]
+        if self.tracks_states:
+            self.current_states.pop()
+        # Words may reuse this vertex on other paths
+        return DFSAction.REVISIT_VERTEX
 
     @override
-    def tree_edge(self, edge: Edge, **kwargs) -> None:
+    def tree_edge(self, edge: Edge, **kwargs) -> Optional[DFSAction]:
         self.travel_edge(edge)
         _, destination = edge
         next_character = self.get_character_from_vertex(destination).lower()
-        if not self.trie.has_subtrie(self.current_prefix + next_character):
-            raise dfsexceptions.PruneSearch
+        self.counters.trie_lookups += 1
+        if self.tracks_states:
+            if self.step_state(next_character) < 0:
+                self.counters.prunes += 1
+                return DFSAction.PRUNE_SEARCH
+            return
+        if not self.trie.has_node(self.current_prefix + next_character):
+            self.counters.prunes += 1
+            return DFSAction.PRUNE_SEARCH
@@ -3,3 +3,5 @@ strands_html_partial_solve = ("Strands_ Uncover words. - "
                               "The New York Times - partial solve.html")
 words_dictionary = "words_dictionary.json"
 words_trie = "words_trie.json"
+words_trie_binary = "words_trie.bin"
+words_letter_count_index = "words_letter_count_index.npz"
@@ -9,3 +9,7 @@ strands_html_partial_solve_path = resources.files(data).joinpath(
 words_dictionary_path = resources.files(data).joinpath(
     filenames.words_dictionary)
 words_trie_path = resources.files(data).joinpath(filenames.words_trie)
+words_trie_binary_path = resources.files(data).joinpath(
+    filenames.words_trie_binary)
+words_letter_count_index_path = resources.files(data).joinpath(
+    filenames.words_letter_count_index)
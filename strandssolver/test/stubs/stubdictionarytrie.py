@@ -4,7 +4,7 @@ import pygtrie
 from typing import Type, override
 from importlib import resources
 
-from strandssolver.models import dictionarytrie
+from strandssolver.models import dictionarytrie, compacttrie
 from strandssolver.models.dictionary import Dictionary
 from strandssolver.test import data
 from strandssolver.test.data import filenames
@@ -13,6 +13,8 @@ from strandssolver.test.stubs import stubdictionary
 
 class StubDictionaryTrieBuilder(dictionarytrie.DictionaryTrieBuilder):
     DEFAULT_TRIE_PATH = resources.files(data).joinpath(filenames.words_trie)
+    DEFAULT_BINARY_TRIE_PATH = resources.files(data).joinpath(
+        filenames.words_trie_binary)
 
     @staticmethod
     @override
@@ -35,6 +37,17 @@ class StubDictionaryTrieBuilder(dictionarytrie.DictionaryTrieBuilder):
             StubDictionaryTrieBuilder, StubDictionaryTrieBuilder
         ).load_trie_from_json(path, encoding=encoding, cast_to=cast_to)
 
+    @staticmethod
+    @override
+    def load_trie_from_binary(path: str | bytes | os.PathLike = None,
+                              verify_checksum: bool = True
+                              ) -> compacttrie.CompactTrie:
+        if path is None:
+            path = StubDictionaryTrieBuilder.DEFAULT_BINARY_TRIE_PATH
+        return super(
+            StubDictionaryTrieBuilder, StubDictionaryTrieBuilder
+        ).load_trie_from_binary(path, verify_checksum=verify_checksum)
+
     @staticmethod
     @override
     def store_trie_as_json(trie: pygtrie.Trie = None,
@@ -24,14 +24,8 @@ class StubHTMLReader(htmlreader.HTMLReader):
             return html
 
     @override
-    def _setup_webdriver(self) -> None:
-        """
-        Stub method
-        """
-        pass
-
-    @override
-    def _get_html_source(self) -> None:
+    def _get_html_source(self, driver: None = None, timeout: float = None
+                         ) -> None:
         """
         Stub method
         """
@@ -0,0 +1,103 @@
+import collections
+import pygtrie
+
+from typing import override, Optional
+
+from strandssolver.dfs import (depthfirstsearch, iterativedepthfirstsearch,
+                               dfsvisitor)
+from strandssolver.dfs.dfsaction import DFSAction
+from strandssolver.dfs.typing import Edge, Vertex
+from strandssolver.solver import strandsdfsvisitor
+from strandssolver.test.stubs import stubgraph
+
+
+class RecordingDFSVisitor(dfsvisitor.IdleDFSVisitor):
+    """
+    Records every callback and prunes tree edges into every third vertex it
+    is offered, so both engines have to agree on pruning as well.
+    """
+    @override
+    def __init__(self) -> None:
+        self.calls = []
+
+    @override
+    def back_edge(self, edge: Edge, **kwargs) -> Optional[DFSAction]:
+        self.calls.append(("back_edge", edge))
+
+    @override
+    def discover_vertex(self, vertex: Vertex, **kwargs
+                        ) -> Optional[DFSAction]:
+        self.calls.append(("discover_vertex", vertex))
+
+    @override
+    def finish_vertex(self, vertex: Vertex, **kwargs
+                      ) -> Optional[DFSAction]:
+        self.calls.append(("finish_vertex", vertex))
+        return DFSAction.REVISIT_VERTEX
+
+    @override
+    def forward_or_cross_edge(self, edge: Edge, **kwargs
+                              ) -> Optional[DFSAction]:
+        self.calls.append(("forward_or_cross_edge", edge))
+
+    @override
+    def tree_edge(self, edge: Edge, **kwargs) -> Optional[DFSAction]:
+        self.calls.append(("tree_edge", edge))
+        if len(self.calls) % 3 == 0:
+            return DFSAction.PRUNE_SEARCH
+
+
+def _run_both(graph, depth_limit, visitor_factory, pass_context=False):
+    original_visitor = visitor_factory()
+    original = list(depthfirstsearch.dfs_edges(
+        graph, depth_limit=depth_limit, dfs_visitor=original_visitor))
+    iterative_visitor = visitor_factory()
+    iterative = list(iterativedepthfirstsearch.dfs_edges(
+        graph, depth_limit=depth_limit, dfs_visitor=iterative_visitor,
+        pass_context=pass_context))
+    return original, original_visitor, iterative, iterative_visitor
+
+
+def test() -> None:
+    graphs = {
+        "small": stubgraph.StubGraphBuilder.build_small_graph(),
+        "board": stubgraph.StubGraphBuilder.build_graph_from_board(),
+    }
+    for name, graph in graphs.items():
+        for depth_limit in (1, 2, 3, 4, None):
+            for pass_context in (False, True):
+                original, _, iterative, _ = _run_both(
+                    graph, depth_limit, dfsvisitor.IdleDFSVisitor,
+                    pass_context)
+                assert original == iterative, (name, depth_limit)
+            for pass_context in (False, True):
+                original, original_visitor, iterative, iterative_visitor = \
+                    _run_both(graph, min(depth_limit or 4, 4),
+                              RecordingDFSVisitor, pass_context)
+                assert original == iterative, (name, depth_limit)
+                assert original_visitor.calls == iterative_visitor.calls, \
+                    (name, depth_limit)
+
+    trie = pygtrie.CharTrie.fromkeys(
+        ["kern", "kernel", "tent", "tents", "rite", "rites", "mite", "miter",
+         "gut", "guts", "omit", "omits", "note", "notes"], True)
+    for name, graph in graphs.items():
+        for node in graph.nodes():
+            visitors = []
+            for engine in (depthfirstsearch, iterativedepthfirstsearch):
+                visitor = strandsdfsvisitor.StrandsDFSVisitor(graph, trie)
+                collections.deque(engine.dfs_edges(graph, source=node,
+                                                   depth_limit=8,
+                                                   dfs_visitor=visitor),
+                                  maxlen=0)
+                visitors.append(visitor)
+            assert visitors[0].words == visitors[1].words, (name, node)
+    print("Both DFS engines agree on all stub graphs.")
+
+
+def main() -> None:
+    test()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+import re
+import subprocess
+import sys
+
+from typing import Dict, List, Tuple
+
+# Entry points and what they must not pull in while being imported
+ENTRY_POINTS: Dict[str, Tuple[str, ...]] = {
+    "strandssolver.solver.solver": ("matplotlib", "pulp", "nptyping",
+                                    "bs4", "selenium"),
+    "strandssolver.models.graph": ("matplotlib",),
+    "strandssolver.parsers.htmlparser": ("bs4", "selenium"),
+    "strandssolver.service.solverservice": ("matplotlib", "pulp",
+                                            "nptyping", "bs4", "selenium"),
+    "strandssolver.solver.batchsolver": ("matplotlib", "pulp", "nptyping",
+                                         "bs4", "selenium"),
+    "main": ("matplotlib", "pulp", "nptyping", "bs4", "selenium"),
+}
+DEFAULT_REPEATS = 5
+
+_IMPORT_TIME_LINE = re.compile(
+    r"import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)")
+
+
+def measure_import(module: str) -> Tuple[float, List[str]]:
+    """
+    Imports the module in a fresh interpreter.
+    :return: cumulative import time in seconds and the top level packages
+    the import loaded
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True)
+    cumulative_microseconds = 0
+    packages = set()
+    for line in completed.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match is None:
+            continue
+        name = match.group(3)
+        packages.add(name.split(".")[0])
+        if name == module:
+            cumulative_microseconds = int(match.group(2))
+    return cumulative_microseconds / 1e6, sorted(packages)
+
+
+def benchmark(module: str, forbidden: Tuple[str, ...],
+              repeats: int = DEFAULT_REPEATS) -> None:
+    seconds = []
+    packages = []
+    for _ in range(repeats):
+        import_seconds, packages = measure_import(module)
+        seconds.append(import_seconds)
+    loaded = [package for package in forbidden if package in packages]
+    assert not loaded, (module, loaded)
+    print(f"{module}: best {min(seconds) * 1000:.1f}ms, "
+          f"median {sorted(seconds)[len(seconds) // 2] * 1000:.1f}ms")
+
+
+def test() -> None:
+    for module, forbidden in ENTRY_POINTS.items():
+        benchmark(module, forbidden)
+    print("No entry point imports a library it does not need.")
+
+
+def main() -> None:
+    test()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+import time
+import numpy as np
+
+from collections import Counter
+
+from strandssolver.models import gamestate, compacttrie
+from strandssolver.solver import (solver, exactcover, optimizecovering,
+                                  spangram, coveringexceptions)
+from strandssolver.test.stubs import (stubgamestate, stubgraph,
+                                      stubdictionarytrie)
+
+
+def count_search_nodes(problem, target, max_words: int, min_words: int
+                       ) -> int:
+    exact_cover_solver = exactcover.ExactCoverSolver(
+        problem, target, max_words, min_input_vector_sum=min_words)
+    try:
+        exact_cover_solver.optimize_binary_vector()
+    except coveringexceptions.NoExactCoverError:
+        pass
+    return exact_cover_solver.number_of_search_nodes
+
+
+def time_optimizer(problem, target, max_words: int, min_words: int
+                   ) -> float:
+    optimizer = optimizecovering.BinaryOptimizer(
+        problem, target, max_words,
+        formulation=optimizecovering.Formulation.SET_PARTITIONING,
+        min_input_vector_sum=min_words)
+    start = time.perf_counter()
+    optimizer.optimize_binary_vector()
+    return time.perf_counter() - start
+
+
+def benchmark(name: str, game: gamestate.GameState, trie) -> None:
+    graph = stubgraph.StubGraphBuilder.build_graph_from_board(game.board)
+    strands_solver = solver.Solver(graph=graph, game=game, trie=trie,
+                                   search_mode=solver.SearchMode.BITBOARD)
+    words = strands_solver.find_all_words()
+    problem = optimizecovering.convert_words_to_sparse_problem_matrix(
+        words, graph)
+    target = np.ones(len(graph.nodes), dtype=np.bool_)
+    min_words = game.number_of_total_words - game.number_of_solved_words
+    max_words = min_words + 1
+
+    sides = spangram.index_words_by_sides(words, game.board.shape)
+    number_of_candidates = sum(map(spangram.is_spangram_candidate, sides))
+    spangram_problem, spangram_target = spangram.add_spangram_row(
+        problem, target, sides)
+
+    print(f"{name}: {len(words)} words, "
+          f"{number_of_candidates} spangram candidates")
+    for label, A, b in (("without spangram row", problem, target),
+                        ("with spangram row", spangram_problem,
+                         spangram_target)):
+        nodes = count_search_nodes(A, b, max_words, min_words)
+        seconds = time_optimizer(A, b, max_words, min_words)
+        print(f"  {label}: {nodes} exact cover search nodes, "
+              f"ILP {seconds:.3f}s")
+
+
+def solve_long_spangram() -> None:
+    """
+    Plants a tiling of the stub board whose 10 cell spangram is longer
+    than the depth limit, so the dictionary only has it in two halves, and
+    a decoy word across the top row that touches two opposite sides.
+    The default solver still has to return the planted tiling exactly.
+    """
+    game = stubgamestate.StubGameState(number_of_total_words=10)
+    graph = stubgraph.StubGraphBuilder.build_graph_from_board(game.board)
+    spangram_path = [(row, 0) for row in range(8)] + [(7, 1), (6, 1)]
+    assert len(spangram_path) > solver.Solver.DEFAULT_DEPTH_LIMIT
+    paths = [spangram_path[:5], spangram_path[5:],
+             [(row, 1) for row in range(6)]]
+    for column in range(2, 6):
+        paths.append([(row, column) for row in range(4)])
+        paths.append([(row, column) for row in range(4, 8)])
+    decoy = [(0, column) for column in range(6)]
+    characters = game.board.characters
+    words = ["".join(characters[node] for node in path).lower()
+             for path in paths + [decoy]]
+    trie = compacttrie.CompactTrieBuilder.build_from_words(words)
+
+    strands_solver = solver.Solver(graph=graph, game=game, trie=trie,
+                                   search_mode=solver.SearchMode.BITBOARD)
+    covering = strands_solver.solve()
+    cells = Counter(node for word in covering for node in word)
+    assert len(cells) == len(graph.nodes) and max(cells.values()) == 1, \
+        covering
+    assert set(map(frozenset, covering)) == set(map(frozenset, paths)), \
+        covering
+    print("The split spangram tiling is solved exactly.")
+
+
+def test() -> None:
+    solve_long_spangram()
+    trie = stubdictionarytrie.StubDictionaryTrieBuilder.load_trie_from_json()
+    benchmark("stub puzzle", stubgamestate.StubGameState(), trie)
+    benchmark("small stub puzzle", stubgamestate.StubSmallGameState(), trie)
+
+
+def main() -> None:
+    test()
+
+
+if __name__ == '__main__':
+    main()